@@ -0,0 +1,91 @@
+"""Compare per-cell clean_hostname with column-wise clean_hostnames
+
+Usage:
+    python benchmarks/clean_hostnames.py [--cells 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from csam_inventory.data_extraction.utils import clean_hostname, clean_hostnames
+
+# fragments combined into synthetic cells, covering the cleaning rules
+FRAGMENTS = [
+    "web01.ed.gov",
+    "APP-02",
+    "db_03",
+    "https://portal.ed.gov/",
+    "10.20.30.40",
+    "srv04 (primary)",
+    "lb05 [dmz]",
+    "ciscoswitch",
+    "NA",
+    "hosté06",
+]
+
+SEPARATORS = [", ", "\n", "\t", "\r\n"]
+
+
+def build_cells(count: int) -> list:
+    """Generate synthetic hostname cells
+
+    Parameters
+    ----------
+    count: int
+        number of cells
+
+    Returns
+    -------
+    list
+        cell values, mostly strings with a few numbers and empty values
+    """
+    random.seed(0)
+    cells = []
+
+    for i in range(count):
+        if i % 100 == 0:
+            cells.append(None)
+            continue
+
+        if i % 101 == 0:
+            cells.append(i)
+            continue
+
+        parts = random.sample(FRAGMENTS, random.randint(1, 3))
+        cells.append(random.choice(SEPARATORS).join(parts) + str(i % 997))
+
+    return cells
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cells', type=int, default=1000000)
+    args = parser.parse_args()
+
+    cells = build_cells(args.cells)
+    values = [x for x in cells if x]
+
+    start = time.perf_counter()
+    scalar = set()
+
+    for value in values:
+        scalar.update(clean_hostname(value))
+
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = set(clean_hostnames(values))
+    batch_time = time.perf_counter() - start
+
+    if scalar != batch:
+        raise RuntimeError("clean_hostname and clean_hostnames disagree.")
+
+    print(f"{len(values)} cells, {len(batch)} unique hostnames")
+    print(f"clean_hostname:  {scalar_time:0.2f} s")
+    print(f"clean_hostnames: {batch_time:0.2f} s "
+          f"({scalar_time / batch_time:0.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
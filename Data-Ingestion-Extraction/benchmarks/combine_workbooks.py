@@ -0,0 +1,163 @@
+"""Compare combining inventory workbooks cell by cell with the streaming
+combiner
+
+A directory of synthetic hardware inventory workbooks is generated and
+combined in a fresh process for each method, so the peak resident set size
+reported for each method is not affected by the others. The cell-copy method
+is the approach the data/combine*.py scripts used before: every cell is
+assigned to an in-memory openpyxl workbook that is saved at the end.
+
+Usage:
+    python benchmarks/combine_workbooks.py [--files 100] [--rows 1000]
+
+Peak RSS is read with the resource module, so this benchmark runs on Linux
+and macOS only. For the parallel method it is the largest of the main process
+and its workers.
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+from csam_inventory.cleanup import combine
+from csam_inventory.cleanup.sheets import read_sheets
+
+COLUMNS = 28
+
+METHODS = ['cell-copy', 'streaming', 'parallel']
+
+
+def build_workbooks(directory: Path, files: int, rows: int) -> None:
+    """Write inventory workbooks with a preamble row, a header row and host
+    rows
+
+    Parameters
+    ----------
+    directory: Path
+        directory in which to create the workbooks
+
+    files: int
+        number of workbooks
+
+    rows: int
+        number of host rows in each workbook
+    """
+    for index in range(files):
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Hardware Inventory")
+
+        sheet.append(["Hardware Inventory"])
+        sheet.append(["Identifier or Host Name", "IP Address (Internal)"]
+                     + [f"Field {i}" for i in range(COLUMNS - 2)])
+
+        for i in range(rows):
+            sheet.append([f"s{index}host{i:06d}.example.gov",
+                          f"10.0.{i // 256 % 256}.{i % 256}"]
+                         + [f"value {i}-{j}" for j in range(COLUMNS - 2)])
+
+        workbook.save(directory / f"hw-inventory-{1000 + index}.xlsx")
+
+
+def copy_cells(file_paths: list, output_path: str) -> None:
+    """Combine workbooks by assigning every cell to an in-memory workbook"""
+    dest_wb = Workbook()
+
+    for file_path in file_paths:
+        file_name = os.path.basename(file_path).split('.')[0]
+        dest_ws = dest_wb.create_sheet(file_name)
+        source_wb = load_workbook(file_path)
+
+        for source_sheet in source_wb.worksheets:
+            for row in source_sheet.rows:
+                for cell in row:
+                    if cell.value is not None:
+                        dest_ws[cell.coordinate] = cell.value
+
+    dest_wb.save(output_path)
+
+
+def run_method(directory: Path, method: str, output_path: str) -> None:
+    """Combine the workbooks in a directory and print the elapsed time, the
+    throughput and the peak RSS
+
+    Parameters
+    ----------
+    directory: Path
+        directory holding the workbooks
+
+    method: str
+        one of METHODS
+
+    output_path: str
+        path of the combined workbook to create
+    """
+    file_paths = combine.find_workbooks(str(directory))
+
+    start = time.perf_counter()
+
+    if method == 'cell-copy':
+        copy_cells(file_paths, output_path)
+    else:
+        workers = 1 if method == 'streaming' else 0
+        combine.combine_workbooks(file_paths, output_path, workers)
+
+    elapsed = time.perf_counter() - start
+    row_count = sum(len(x.rows) for x in read_sheets(output_path))
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    peak_mb = peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+    print(f"{method:>10}: {elapsed:0.2f} s, {row_count / elapsed:0.0f} "
+          f"rows/sec, peak RSS {peak_mb:0.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--method', choices=METHODS, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.method:
+        run_method(Path(args.path), args.method, args.output)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        sources = Path(directory) / "sources"
+        sources.mkdir()
+
+        print(f"Building {args.files} workbooks with {args.rows} rows.")
+        build_workbooks(sources, args.files, args.rows)
+
+        outputs = {}
+
+        for method in METHODS:
+            outputs[method] = str(Path(directory) / f"{method}.xlsx")
+            subprocess.run([sys.executable, __file__, '--method', method,
+                            '--path', str(sources), '--output',
+                            outputs[method]], check=True)
+
+        # the cell-copy workbook starts with openpyxl's default empty sheet
+        expected = [(x.name, x.rows) for x in read_sheets(outputs['cell-copy'])
+                    if x.rows]
+
+        for method in METHODS[1:]:
+            if [(x.name, x.rows) for x in read_sheets(outputs[method])] \
+                    != expected:
+                raise RuntimeError(f"{method} combined workbook differs.")
+
+
+if __name__ == "__main__":
+    main()
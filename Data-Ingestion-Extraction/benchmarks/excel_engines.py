@@ -0,0 +1,220 @@
+"""Compare workbook load times of the calamine and openpyxl engines
+
+A corpus of synthetic hardware inventory workbooks is generated using the
+column layouts of the V2.3 and V2.0 templates and of the older free-form
+template. Each workbook is then loaded with each engine, both through the
+package's reader (as ExcelProcessor does) and through pandas.read_excel (as
+the Data-Wrangling scripts do), and the results of the engines are checked
+for agreement.
+
+Usage:
+    python benchmarks/excel_engines.py [--rows 5000] [--workbooks 3]
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+
+from pathlib import Path
+
+import pandas as pd
+
+from openpyxl import Workbook
+
+from csam_inventory.data_extraction import excel, readers
+
+V20_COLUMNS = [
+    'Identifier or Host Name', 'IP Address (Internal)',
+    'IP Address (External)', 'NAT IPs', 'AD Domain', 'CPU Core',
+    'Memory (GB)', 'Drive Space (GB)', 'High Value Asset',
+    'Manufacturer Serial Number', 'MAC Address(es)', 'BIOS UUID/GUID',
+    'Asset Category', 'Asset Type', 'Virtual', 'Public', 'GFE',
+    'Hardware Make', 'Hardware Model', 'OS Name', 'OS Version', 'Lifecycle',
+    'Location', 'Hosting/CSP Contract',
+    'Date Device Added to System Boundary', 'Device Operator',
+    'Systems Supported', 'System Owner / Device Manager',
+]
+
+V23_COLUMNS = V20_COLUMNS[:26] + [
+    'Systems Supported CSAM Acronym', 'System Owner / Device Manager',
+    'Primary System Boundary CSAM ID', 'Primary System Boundary CSAM Acronym',
+    'System Supported CSAM ID', 'First Tier Supplier',
+]
+
+OLD_COLUMNS = ['Identifier or Host Name', 'IP Address', 'Operating System',
+               'Function', 'Location']
+
+TEMPLATES = {
+    'V2.3': V23_COLUMNS,
+    'V2.0': V20_COLUMNS,
+    'old': OLD_COLUMNS,
+}
+
+
+def cell_value(column: str, row: int):
+    """Generate a plausible value for a cell
+
+    Parameters
+    ----------
+    column: str
+        header of the cell's column
+
+    row: int
+        index of the host row
+
+    Returns
+    -------
+    object
+        a string, number or date depending on the column
+    """
+    if column == 'Identifier or Host Name':
+        return f"host{row:06d}.example.gov"
+
+    if column.startswith('IP Address'):
+        return f"10.{row // 65536 % 256}.{row // 256 % 256}.{row % 256}"
+
+    if column in ('CPU Core', 'Memory (GB)', 'Drive Space (GB)'):
+        return (row % 64) + 1
+
+    if column.startswith('Date'):
+        return datetime.datetime(2024, 1, 1) + datetime.timedelta(days=row % 365)
+
+    return f"{column} {row % 97}"
+
+
+def build_workbook(path: Path, columns: list, rows: int,
+                   sheets: int) -> None:
+    """Write a combined inventory workbook with one sheet per system
+
+    Parameters
+    ----------
+    path: Path
+        location of the workbook to create
+
+    columns: list
+        header row of the template
+
+    rows: int
+        number of host rows across all sheets
+
+    sheets: int
+        number of sheets
+    """
+    workbook = Workbook(write_only=True)
+
+    for sheet_index in range(sheets):
+        sheet = workbook.create_sheet(f"hw-inventory-{sheet_index + 1}")
+        sheet.append(columns)
+
+        for row in range(sheet_index, rows, sheets):
+            sheet.append([cell_value(x, row) for x in columns])
+
+    workbook.save(path)
+
+
+def load_rows(path: Path, engine: str) -> int:
+    """Read every row of a workbook with the package's reader
+
+    Parameters
+    ----------
+    path: Path
+        workbook to read
+
+    engine: str
+        one of readers.ENGINES
+
+    Returns
+    -------
+    int
+        number of rows read
+    """
+    count = 0
+
+    with readers.open_workbook(str(path), engine) as workbook:
+        for sheet_name in workbook.sheet_names:
+            for _ in workbook.iter_rows(sheet_name):
+                count += 1
+
+    return count
+
+
+def time_call(function, *args, **kwargs):
+    """Call a function and time it
+
+    Returns
+    -------
+    object, float
+        the function's result and the elapsed time in seconds
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000,
+                        help="host rows per workbook")
+    parser.add_argument('--workbooks', type=int, default=3,
+                        help="workbooks per template")
+    parser.add_argument('--sheets', type=int, default=10,
+                        help="sheets per workbook")
+    args = parser.parse_args()
+
+    totals = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = []
+
+        for template, columns in TEMPLATES.items():
+            for index in range(args.workbooks):
+                path = (Path(directory)
+                        / f"{template}-{index}".replace('.', '_'))
+                path = path.with_suffix('.xlsx')
+                build_workbook(path, columns, args.rows, args.sheets)
+                corpus.append((template, path))
+
+        print(f"Built {len(corpus)} workbooks with {args.rows} rows each.")
+
+        for template, path in corpus:
+            hostnames = {}
+            frames = {}
+
+            for engine in readers.ENGINES:
+                rows, elapsed = time_call(load_rows, path, engine)
+                totals[(template, engine, 'rows')] = (
+                    totals.get((template, engine, 'rows'), 0) + elapsed
+                )
+
+                frames[engine], elapsed = time_call(
+                    pd.read_excel, path, sheet_name=None, engine=engine
+                )
+                totals[(template, engine, 'pandas')] = (
+                    totals.get((template, engine, 'pandas'), 0) + elapsed
+                )
+
+                hostnames[engine] = sorted(
+                    excel.extract_hostnames(str(path), engine=engine)
+                )
+
+            if hostnames[readers.CALAMINE_ENGINE] != \
+                    hostnames[readers.OPENPYXL_ENGINE]:
+                raise RuntimeError(f"Engines disagree on {path.name}.")
+
+            for sheet_name, frame in frames[readers.OPENPYXL_ENGINE].items():
+                pd.testing.assert_frame_equal(
+                    frame, frames[readers.CALAMINE_ENGINE][sheet_name]
+                )
+
+    print(f"{'template':>8} {'engine':>9} {'reader':>9} {'pandas':>9}")
+
+    for template in TEMPLATES:
+        for engine in readers.ENGINES:
+            print(f"{template:>8} {engine:>9} "
+                  f"{totals[(template, engine, 'rows')]:>8.2f}s "
+                  f"{totals[(template, engine, 'pandas')]:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
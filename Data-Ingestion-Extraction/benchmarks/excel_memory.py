@@ -0,0 +1,107 @@
+"""Compare peak memory of the Excel workbook loading modes
+
+A synthetic hardware inventory workbook is generated and hostnames are
+extracted from it in a fresh process for each mode, so the peak resident set
+size reported for each mode is not affected by the other.
+
+Usage:
+    python benchmarks/excel_memory.py [--rows 100000] [--columns 28]
+
+Peak RSS is read with the resource module, so this benchmark runs on Linux
+and macOS only.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from csam_inventory.data_extraction import excel
+
+
+def build_workbook(path: Path, rows: int, columns: int) -> None:
+    """Write a single sheet inventory with a few preamble rows, a header row
+    and the requested number of host rows
+
+    Parameters
+    ----------
+    path: Path
+        location of the workbook to create
+
+    rows: int
+        number of host rows
+
+    columns: int
+        number of columns in each row
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Hardware Inventory")
+
+    sheet.append(["Hardware Inventory"])
+    sheet.append(["Guidance: complete one row per device"])
+    sheet.append(["Identifier or Host Name", "IP Address (Internal)"]
+                 + [f"Field {i}" for i in range(columns - 2)])
+
+    for i in range(rows):
+        address = f"10.0.{i // 256 % 256}.{i % 256}"
+        sheet.append([f"host{i:07d}.example.gov", address]
+                     + [f"value {i}-{j}" for j in range(columns - 2)])
+
+    workbook.save(path)
+
+
+def run_mode(path: Path, mode: str) -> None:
+    """Extract hostnames from a workbook and print the hostname count, the
+    elapsed time and the peak RSS of the current process
+
+    Parameters
+    ----------
+    path: Path
+        workbook to process
+
+    mode: str
+        one of the ExcelProcessor loading modes
+    """
+    start = time.perf_counter()
+    hostnames = excel.extract_hostnames(str(path), mode)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+    print(f"{mode:>10}: {len(hostnames)} hosts, {elapsed:0.2f} s, "
+          f"peak RSS {peak_mb:0.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=28)
+    parser.add_argument('--mode', choices=excel.MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(Path(args.path), args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "hw-inventory-0.xlsx"
+        print(f"Building workbook with {args.rows} rows and {args.columns} "
+              "columns.")
+        build_workbook(path, args.rows, args.columns)
+
+        for mode in excel.MODES:
+            subprocess.run([sys.executable, __file__, '--mode', mode,
+                            '--path', str(path)], check=True)
+
+
+if __name__ == "__main__":
+    main()
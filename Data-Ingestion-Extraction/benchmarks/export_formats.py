@@ -0,0 +1,121 @@
+"""Compare writing, loading and file sizes of the inventory export formats
+
+A synthetic consolidated inventory is exported with the original per-host
+f-string CSV writer and with each writer in csam_inventory.export, then each
+file is loaded back into a DataFrame.
+
+Usage:
+    python benchmarks/export_formats.py [--systems 2000] [--hosts 200]
+"""
+
+import argparse
+import tempfile
+import time
+
+from pathlib import Path
+
+import pandas as pd
+
+from csam_inventory import export
+
+
+def build_inventories(systems: int, hosts: int) -> tuple:
+    """Generate synthetic inventories and organization data
+
+    Parameters
+    ----------
+    systems: int
+        number of systems
+
+    hosts: int
+        number of hosts per system
+
+    Returns
+    -------
+    dict[int, list[str]], dict[int, tuple[str, str]]
+        sorted hostnames of each system, and the organization and acronym of
+        each system
+    """
+    inventories = {
+        system_id: sorted(f"s{system_id}host{x:05d}.example.gov"
+                          for x in range(hosts))
+        for system_id in range(1000, 1000 + systems)
+    }
+    id_org_acronym = {
+        system_id: (f"Office {system_id % 12}", f"SYS{system_id}")
+        for system_id in inventories
+    }
+
+    return inventories, id_org_acronym
+
+
+def write_f_strings(columns: dict, output_path: Path) -> None:
+    """Write the inventory one f-string per host, as export_inventories did"""
+    with open(output_path, 'w') as out_file:
+        out_file.write("csam_id,org,acronym,id_acronym,hostname\n")
+
+        for row in zip(*(columns[x] for x in export.COLUMNS)):
+            system_id, org, acronym, _, host = row
+            out_file.write(f"{system_id},{org},{acronym},"
+                           f"{system_id}-{acronym},{host}\n")
+
+
+def load(path: Path) -> pd.DataFrame:
+    """Load an exported inventory into a DataFrame"""
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+
+    if path.suffix == '.arrow':
+        with export.pyarrow.ipc.open_file(str(path)) as reader:
+            return reader.read_pandas()
+
+    return pd.read_csv(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--systems', type=int, default=2000,
+                        help="number of systems")
+    parser.add_argument('--hosts', type=int, default=200,
+                        help="hosts per system")
+    args = parser.parse_args()
+
+    inventories, id_org_acronym = build_inventories(args.systems, args.hosts)
+    columns = export.inventory_columns(inventories, id_org_acronym)
+
+    writers = {'f-strings': (write_f_strings, '.csv')}
+    writers.update(export.EXPORT_FORMATS)
+
+    if export.pyarrow is None:
+        print("pyarrow is not installed; only timing CSV.")
+        writers = {k: v for k, v in writers.items()
+                   if v[1] == '.csv'}
+
+    print(f"{len(columns['hostname'])} hosts")
+    print(f"{'writer':>10} {'write':>8} {'load':>8} {'size':>10}")
+    frames = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (writer, suffix) in writers.items():
+            path = (Path(directory) / name).with_suffix(suffix)
+
+            start = time.perf_counter()
+            writer(columns, path)
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            frame = load(path)
+            load_time = time.perf_counter() - start
+
+            frames.append(frame.astype(str))
+            size = path.stat().st_size / 2 ** 20
+
+            print(f"{name:>10} {write_time:>7.2f}s {load_time:>7.2f}s "
+                  f"{size:>7.1f} MB")
+
+    for frame in frames[1:]:
+        pd.testing.assert_frame_equal(frames[0], frame, check_dtype=False)
+
+
+if __name__ == "__main__":
+    main()
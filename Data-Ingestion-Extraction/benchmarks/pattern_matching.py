@@ -0,0 +1,116 @@
+"""Measure the cost of checking a row against growing lists of strings
+
+Rows of synthetic inventory cells are checked against lists of marker
+strings of increasing length, once by testing each string in turn, as the
+cleanup scripts and ExcelProcessor._is_good_row did, once with a plain
+regular expression alternation and once with a PatternMatcher. The time per
+row is reported for a substring search of every cell and for a prefix check
+of the first cell.
+
+Usage:
+    python benchmarks/pattern_matching.py [--rows 2000] [--patterns 10 100]
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from typing import Callable, List
+
+from csam_inventory.data_extraction.matching import PatternMatcher
+
+COLUMNS = 28
+
+
+def random_word(length: int) -> str:
+    """Generate a random lowercase word"""
+    return ''.join(random.choice(string.ascii_lowercase + ' -')
+                   for _ in range(length))
+
+
+def build_rows(rows: int, markers: List[str]) -> List[tuple]:
+    """Generate rows of cells, one in ten containing a marker
+
+    Parameters
+    ----------
+    rows: int
+        number of rows
+
+    markers: List[str]
+        marker strings
+
+    Returns
+    -------
+    List[tuple]
+        values of the cells of each row
+    """
+    result = []
+
+    for i in range(rows):
+        row = [f"host{i:06d}"] + [random_word(12) for _ in range(COLUMNS - 1)]
+
+        if i % 10 == 0:
+            row[random.randrange(COLUMNS)] = random.choice(markers) + " note"
+
+        result.append(tuple(row))
+
+    return result
+
+
+def time_rows(name: str, rows: List[tuple], check: Callable) -> List[bool]:
+    """Apply a check to every row and report the time per row"""
+    start = time.perf_counter()
+    results = [check(x) for x in rows]
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<20} {1e6 * elapsed / len(rows):8.1f} us/row, "
+          f"{sum(results)} matched")
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--patterns', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for count in args.patterns:
+        random.seed(0)
+        markers = [random_word(random.randint(8, 24)) for _ in range(count)]
+        rows = build_rows(args.rows, markers)
+        alternation = re.compile('|'.join(re.escape(x) for x in markers))
+        matcher = PatternMatcher(markers)
+
+        print(f"{count} patterns, substring search of every cell")
+        expected = time_rows(
+            "loop", rows,
+            lambda row: any(cell and any(x in str(cell) for x in markers)
+                            for cell in row))
+        results = [
+            time_rows("alternation", rows, lambda row: alternation.search(
+                '\x00'.join(str(x) for x in row if x)) is not None),
+            time_rows("PatternMatcher", rows, matcher.search_cells),
+        ]
+
+        print(f"{count} patterns, prefix check of the first cell")
+        firsts = [x[0] if i % 3 else random.choice(markers)
+                  for i, x in enumerate(rows)]
+        expected_prefix = time_rows(
+            "loop", firsts,
+            lambda cell: any(cell.startswith(x) for x in markers))
+        prefix_results = [
+            time_rows("alternation", firsts,
+                      lambda cell: alternation.match(cell) is not None),
+            time_rows("PatternMatcher", firsts, matcher.match),
+        ]
+
+        if any(x != expected for x in results) or \
+                any(x != expected_prefix for x in prefix_results):
+            raise RuntimeError("The methods matched different rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Compare reading split hostname tables through the python-docx object model
+with the single-pass table grid built from the document XML
+
+Each synthetic document holds several inventories, each split into a table
+with a header row followed by many continuation tables without headers, as
+happens when a table breaks across pages. Some continuation tables start
+with a vertically merged cell and some rows contain cells spanning several
+grid columns.
+
+Usage:
+    python benchmarks/word_tables.py [--tables 500] [--rows 20]
+"""
+
+import argparse
+import tempfile
+import time
+
+from pathlib import Path
+
+import docx
+
+from docx.table import _Cell
+
+from csam_inventory.data_extraction import document
+from csam_inventory.data_extraction.tables import HEADERS
+from csam_inventory.data_extraction.utils import clean_hostname
+
+COLUMNS = ['Hostname', 'IP Address', 'Operating System', 'Location']
+
+
+def build_document(path: Path, tables: int, rows: int,
+                   inventories: int) -> None:
+    """Write a Word document with hostname tables split into many pieces
+
+    Parameters
+    ----------
+    path: Path
+        location of the document to create
+
+    tables: int
+        number of tables in the document
+
+    rows: int
+        number of rows in each table
+
+    inventories: int
+        number of separate inventories the tables belong to
+    """
+    document_ = docx.Document()
+    per_inventory = max(tables // inventories, 1)
+    host = 0
+
+    for table_index in range(tables):
+        inventory = table_index // per_inventory
+        first = table_index % per_inventory == 0
+
+        if first:
+            document_.add_paragraph(f"Inventory {inventory}")
+
+        table = document_.add_table(rows=rows, cols=len(COLUMNS))
+
+        for row_index, row in enumerate(table.rows):
+            if first and row_index == 0:
+                values = COLUMNS
+            else:
+                values = [f"s{inventory:03d}host{host:06d}.example.gov",
+                          f"10.0.{host // 256 % 256}.{host % 256}",
+                          "Linux", "Data Center"]
+                host += 1
+
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+
+        # merge the location column of the last two rows, and the first
+        # column of the first two rows of some continuation tables
+        table.cell(rows - 2, 3).merge(table.cell(rows - 1, 3))
+
+        if not first and table_index % 7 == 0:
+            table.cell(0, 0).merge(table.cell(1, 0))
+
+        # a page break splits each table from the next
+        document_.add_paragraph().add_run().add_break(
+            docx.enum.text.WD_BREAK.PAGE
+        )
+
+    document_.save(path)
+
+
+def object_model_extract(path: Path) -> list:
+    """Extract hostnames by reading every cell through python-docx objects
+    and scanning each table cell by cell for a header
+
+    Parameters
+    ----------
+    path: Path
+        document to read
+
+    Returns
+    -------
+    list
+        unique hostnames
+    """
+    hostnames = []
+    previous_column = 0
+    previous_header = None
+
+    for table in docx.Document(path).tables:
+        rows = [[None if tc.vMerge == 'continue' else _Cell(tc, table).text
+                 for tc in tr.tc_lst]
+                for tr in table._tbl.tr_lst]
+
+        def cell(row_index, column_index):
+            if not 1 <= row_index <= len(rows):
+                return None
+            cells = rows[row_index - 1]
+            if not 1 <= column_index <= len(cells):
+                return None
+            return cells[column_index - 1]
+
+        column_count = len(table._tbl.tblGrid.gridCol_lst)
+        header_row, host_column, header = None, None, None
+
+        for row_index in range(1, len(rows) + 1):
+            for column_index in range(1, column_count + 1):
+                text = cell(row_index, column_index)
+                found = text is not None and next(
+                    (x for x in HEADERS
+                     if x in text.lower().replace(" ", "")), None
+                )
+                if found:
+                    header_row, host_column, header = (row_index,
+                                                       column_index, found)
+                    break
+            if header:
+                break
+
+        if not host_column and not previous_column:
+            continue
+
+        if hostnames and previous_column:
+            if column_count <= previous_column or not rows:
+                continue
+
+            test_text = cell(1, previous_column)
+            if test_text is None:
+                test_text = cell(2, previous_column) or ""
+
+            test_hostnames = clean_hostname(test_text, previous_header)
+            if not test_hostnames:
+                continue
+
+            if test_hostnames[0][:4] == hostnames[-1][:4]:
+                header_row = 0
+                host_column = previous_column
+                header = previous_header
+            else:
+                previous_column = 0
+                previous_header = None
+                continue
+
+        if not host_column:
+            continue
+
+        for row_index in range(header_row + 1, len(rows) + 1):
+            text = cell(row_index, host_column)
+            if text is not None:
+                hostnames.extend(clean_hostname(text, header))
+
+        previous_column = host_column
+        previous_header = header
+
+    return list(set(hostnames))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=500,
+                        help="tables per document")
+    parser.add_argument('--rows', type=int, default=20,
+                        help="rows per table")
+    parser.add_argument('--inventories', type=int, default=5,
+                        help="inventories the tables are split from")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of times each method is timed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'split-tables.docx'
+        build_document(path, args.tables, args.rows, args.inventories)
+
+        print(f"Built a document with {args.tables} tables of {args.rows} "
+              f"rows.")
+
+        methods = {
+            'object model': object_model_extract,
+            'table grid': lambda x: document.extract_hostnames(str(x)),
+        }
+        results = {}
+
+        for name, method in methods.items():
+            elapsed = []
+
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[name] = sorted(method(path))
+                elapsed.append(time.perf_counter() - start)
+
+            print(f"{name:>13}: {min(elapsed):.3f}s "
+                  f"({len(results[name])} hostnames)")
+
+        if len(set(map(tuple, results.values()))) != 1:
+            raise RuntimeError("Methods found different hostnames.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,22 @@
-import openpyxl
+from csam_inventory.cleanup.rows import RowFilter, filter_rows
+from csam_inventory.cleanup.sheets import read_sheets, write_sheets
 
-# Function to check if a row contains a specific string
-def row_contains_string(row, target_strings):
-    for cell in row:
-        if cell.value and any(target in str(cell.value) for target in target_strings):
-            return True
-    return False
+# Row numbers to delete (1-based index)
+rows_to_delete = [1, 3, 4, 5]
 
-# Load the workbook
-workbook = openpyxl.load_workbook('CombinedNewTemplate.xlsx')
-
-# Iterate through each sheet in the workbook
-for sheet_name in workbook.sheetnames:
-    sheet = workbook[sheet_name]
-
-    # List of row numbers to delete (1-based index)
-    rows_to_delete = [1, 3, 4, 5]
+# Strings to check for in the cells
+target_strings = ["EDUPTCVPP005", "FL-EDSW-01"]
 
-    # Strings to check for in the cells
-    target_strings = ["EDUPTCVPP005", "FL-EDSW-01"]
+# Rows anywhere in the sheet that contain any of the target strings are deleted along with rows_to_delete,
+# all in a single pass over each sheet
+row_filter = RowFilter(target_strings, rows_to_delete, scan_rows=None)
 
-    # Iterate through the rows and mark for deletion if they contain the target strings
-    for row_num, row in enumerate(sheet.iter_rows(), start=1):
-        if row_contains_string(row, target_strings):
-            rows_to_delete.append(row_num)
-
-    # Sort the rows to delete in descending order
-    rows_to_delete.sort(reverse=True)
+# Load the workbook
+sheets = read_sheets('CombinedNewTemplate.xlsx')
 
-    # Delete the rows
-    for row_num in rows_to_delete:
-        sheet.delete_rows(row_num)
+# Iterate through each sheet in the workbook and keep the rows that are not marked for deletion
+for sheet in sheets:
+    filter_rows(sheet, row_filter)
 
 # Save the modified workbook
-workbook.save('Clean-CombinedNewTemplate.xlsx')
+write_sheets(sheets, 'Clean-CombinedNewTemplate.xlsx')
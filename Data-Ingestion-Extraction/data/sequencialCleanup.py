@@ -1,41 +1,28 @@
-import subprocess
-import pandas as pd
+import logging
 
+from csam_inventory.cleanup.combine import find_workbooks
+from csam_inventory.cleanup.pipeline import default_pipeline
 
-def run_script(script_path, *args):
-    command = ['python', script_path, *args]
-    subprocess.run(command, check=True)
-
-
-# Run the first script
-print('Combining all HWAM files and remove extra sheets......')
-run_script('combineNewTemplate-RemoveExtraSheets.py')
-
-# Run the second script
-print('Separate all templates based on versions used, V2.0 or V2.3 or Old Template.......')
-run_script('seperateNew-Old-Latest-TemplateHW.py')
-
-
-# Run the third script
-print('Removing unwanted rows from V2.0 inventories.....')
-run_script('conditionalDeleteUnwantedRows.py')
-
-
-# Run the forth script
-print('Removing unwanted rows from V2.3 inventories.....')
-run_script('v-2-3-conditionalDeleteUnwantedRows.py')
-
-
-# Run the fifth script
-print('Check for missing columns and insert them wherever necessary from V2.3 inventories.....')
-run_script('insertMissingColumnsCSAMTemplate.py')
-
-
-# Run the sixth script
-print('Check for missing columns and insert them wherever necessary from V2.0 inventories.....')
-run_script('insertMissingColumnsNewTemplate.py')
+dir_containing_files = "C:\\Users\\Sudhangi.Suthrave\\PycharmProjects\\inventory\\csam_inventory\\data"
 
+# Number of processes reading HW inventory files at the same time, 0 uses all CPUs
+workers = 0
 
 
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+    # Every HWAM file is read once, all cleanup steps run in memory and each output workbook is written once:
+    # 1. combine all HWAM files and remove extra sheets
+    # 2. separate all templates based on versions used, V2.0 or V2.3 or Old Template
+    # 3. remove unwanted rows from V2.0 inventories
+    # 4. remove unwanted rows from V2.3 inventories
+    # 5. check for missing columns and insert them wherever necessary in V2.3 inventories
+    # 6. check for missing columns and insert them wherever necessary in V2.0 inventories
+    # 7. save CorrectedCombinedFile-CSAMTemplate.xlsx, CorrectedCombinedFile-NewTemplate.xlsx and
+    #    Raw-CombinedFile-OldTemplate.xlsx
+    pipeline = default_pipeline(find_workbooks(dir_containing_files), workers)
+    pipeline.run()
 
+    # Show where the time went
+    pipeline.log_timings()
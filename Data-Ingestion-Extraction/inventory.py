@@ -8,29 +8,72 @@ import argparse
 import logging
 import logging.config
 
-from csv import reader
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import yaml
 
-from csam_inventory import csam, extract, utils
+from csam_inventory import (cache, csam, export, extract, manifest,
+                            processing, utils)
 
-def download_csam_inventories(config: Dict) -> None:
+def download_csam_inventories(config: Dict,
+                              retry_failed: bool = False) -> None:
     """Scrape the CSAM site to download hardware inventory files
 
+    When scraping.concurrency is greater than one, inventories are downloaded
+    by that many browser sessions in parallel. The outcome for each system is
+    recorded in a run manifest, and systems downloaded successfully within
+    scraping.freshness_hours are skipped, so an interrupted run resumes where
+    it stopped.
+
     Parameters
     ----------
     config: dict
         dictionary with configuration data, usually loaded from config.yml
+
+    retry_failed: bool
+        if true, only download systems whose last attempt failed, according
+        to the run manifest; default: False
     """
+    concurrency = config['scraping'].get('concurrency', 1)
+    freshness_hours = config['scraping'].get('freshness_hours',
+                                             manifest.DEFAULT_FRESHNESS_HOURS)
+    download_path = Path(config['scraping']['download_path'])
+    run_manifest = manifest.RunManifest(manifest.default_manifest_path(config))
+
     scraper = csam.CsamScraper(config)
-    scraper.login()
-    system_ids = scraper.retrieve_system_list()
-    scraper.collect_hardware_inventories(system_ids)
 
+    try:
+        scraper.login()
+
+        if retry_failed:
+            system_ids = run_manifest.failed()
+            logging.info("Retrying %d systems that failed to download.",
+                         len(system_ids))
+        else:
+            all_ids = scraper.retrieve_system_list()
+            system_ids = run_manifest.pending(all_ids, download_path,
+                                              freshness_hours)
+            logging.info("Skipping %d systems downloaded in the last %s "
+                         "hours.", len(all_ids) - len(system_ids),
+                         freshness_hours)
+
+        if concurrency <= 1:
+            scraper.collect_hardware_inventories(system_ids, run_manifest)
+
+    finally:
+        scraper.cleanup()
 
-def process_inventories(config: Dict) -> Dict[int, List[str]]:
+    if concurrency > 1:
+        csam.collect_hardware_inventories_concurrently(
+            config, system_ids, concurrency, run_manifest
+        )
+
+    run_manifest.log_summary(system_ids)
+
+
+def process_inventories(config: Dict,
+                        workers: Optional[int] = None) -> Dict[int, List[str]]:
     """Process hardware inventory files to extract hostnames
 
     Parameters
@@ -38,29 +81,95 @@ def process_inventories(config: Dict) -> Dict[int, List[str]]:
     config: dict
         dictionary with configuration data, usually loaded from config.yml
 
+    workers: int
+        number of worker processes used to extract hostnames; if not
+        specified, the value of processing.workers in the configuration is
+        used; values less than 1 use one worker per available CPU
+
+    Files whose contents have not changed since a previous run are served
+    from the extraction cache unless processing.cache is false. Word and PDF
+    files are read with the backend selected by processing.word_backend.
+
     Returns
     -------
     dict[int, list[str]]
         dictionary with system IDs as keys and a list of system hostnames as
         the corresponding values
     """
-    results = {}
+    options = config.get('processing', {})
+
+    if workers is None:
+        workers = options.get('workers', 1)
+
+    # select extractors before the cache version, which depends on them, is
+    # computed
+    extract.configure(options)
+
     output_path = Path(config['scraping']['download_path'])
+    file_paths = []
 
-    for item in output_path.iterdir():
+    for item in sorted(output_path.iterdir()):
         if (not item.is_file()
                 or item.name.lower() == csam.ID_ORG_ACRONYM_FILE_NAME):
             continue
 
-        *_, system_id = item.stem.split('-')
-        hostnames = extract.extract_hostnames(str(item.resolve()))
-        results[system_id] = hostnames
+        file_paths.append(str(item.resolve()))
+
+    file_results = {}
+    digests = {}
+    extraction_cache = None
+
+    if options.get('cache', True):
+        extraction_cache = cache.ExtractionCache(
+            cache.default_cache_path(config)
+        )
+
+        for file_path in file_paths:
+            digest = cache.file_digest(file_path)
+            hostnames = extraction_cache.get(Path(file_path).name, digest)
+
+            if hostnames is None:
+                digests[file_path] = digest
+            else:
+                file_results[file_path] = hostnames
+
+        pending_paths = list(digests)
+    else:
+        pending_paths = file_paths
+
+    try:
+        for file_path, hostnames, elapsed in processing.extract_files(
+                pending_paths, workers, options):
+            logging.info("Extracted %d hostnames from %s in %.2f s.",
+                         len(hostnames), file_path, elapsed)
+            file_results[file_path] = hostnames
+
+            if extraction_cache is not None:
+                extraction_cache.put(Path(file_path).name,
+                                     digests[file_path], hostnames)
+
+    finally:
+        if extraction_cache is not None:
+            logging.info("Extraction cache: %d hits, %d misses.",
+                         extraction_cache.hits, extraction_cache.misses)
+            extraction_cache.prune()
+            extraction_cache.close()
+
+    # merge in file order so that results do not depend on the order in which
+    # workers finish; files sharing a system ID are combined
+    results = {}
+
+    for file_path in file_paths:
+        *_, system_id = Path(file_path).stem.split('-')
+        results.setdefault(system_id, set()).update(file_results[file_path])
 
-    return results
+    return {system_id: sorted(hostnames)
+            for system_id, hostnames in results.items()}
 
 
 def export_inventories(config: Dict, inventories: Dict[int, List[str]],
-                       output_name: str) -> None:
+                       output_stem: str,
+                       export_format: str = export.DEFAULT_FORMAT) -> Path:
     """Export system inventories to a single file
 
     Parameters
@@ -69,41 +178,33 @@ def export_inventories(config: Dict, inventories: Dict[int, List[str]],
         dictionary with configuration data, usually loaded from config.yml
 
     inventories: dict[int, list[str]]
-        dictionary with system IDs as keys and a list of system hostnames as
-        the corresponding values
+        dictionary with system IDs as keys and a sorted list of system
+        hostnames as the corresponding values
+
+    output_stem: str
+        name of the file to be created and containing inventory data,
+        without a suffix
 
-    output_name: str
-        name of CSV file to be created and containing inventory data
+    export_format: str
+        format of the file: csv, parquet or arrow; default: csv
+
+    Returns
+    -------
+    Path
+        path of the file created
     """
     id_org_acronym_path = (Path(config['scraping']['download_path'])
                            / csam.ID_ORG_ACRONYM_FILE_NAME)
 
-    id_org_acronym = {}
-
-    with open(id_org_acronym_path) as csv_file:
-        csv_reader = reader(csv_file)
-
-        for row in csv_reader:
-            id_, org, acronym = row  # type: (str, str, str)
-
-            if not id_.isnumeric():
-                continue
-
-            id_org_acronym[int(id_)] = (org, acronym)
-
-    with open(output_name, 'w') as out_file:
-        out_file.write("csam_id,org,acronym,id_acronym,hostname\n")
-
-        for system_id, hostnames in inventories.items():
-            org, acronym = id_org_acronym.get(int(system_id), ("", ""))
-
-            for host in sorted(hostnames):
-                out_file.write(f"{system_id},{org},{acronym},"
-                               f"{system_id}-{acronym},{host}\n")
+    return export.export_inventories(inventories, id_org_acronym_path,
+                                     output_stem, export_format)
 
 
 def main(skip_download: bool = False,
-         config_path: str = "./config.yml") -> None:
+         config_path: str = "./config.yml",
+         workers: Optional[int] = None,
+         retry_failed: bool = False,
+         export_format: str = export.DEFAULT_FORMAT) -> None:
     """Main function for inventory collection; calls other functions for each
     step of the process
 
@@ -116,6 +217,18 @@ def main(skip_download: bool = False,
 
     config_path: str
         path to the configuration file; default: './config.yml'
+
+    workers: int
+        number of worker processes used to extract hostnames; overrides the
+        value in the configuration file when specified
+
+    retry_failed: bool
+        if true, only download systems whose last download attempt failed;
+        default: False
+
+    export_format: str
+        format of the consolidated inventory: csv, parquet or arrow;
+        default: csv
     """
     config_path = Path(config_path).resolve()
     with open(config_path, 'r') as config_file:
@@ -129,14 +242,15 @@ def main(skip_download: bool = False,
 
     if not skip_download:
         logging.info("Beginning download of hardware inventory.")
-        download_csam_inventories(config)
+        download_csam_inventories(config, retry_failed)
 
     logging.info("Beginning processing of hardware inventory.")
-    inventories = process_inventories(config)
+    inventories = process_inventories(config, workers)
 
     logging.info("Exporting consolidated hardware inventory.")
-    export_inventories(config, inventories, 'hostnames.csv')
-    logging.info("Consolidated inventory exported to hostnames.csv.")
+    output_path = export_inventories(config, inventories, 'hostnames',
+                                     export_format)
+    logging.info("Consolidated inventory exported to %s.", output_path)
 
 
 if __name__ == "__main__":
@@ -154,5 +268,27 @@ if __name__ == "__main__":
         default="./config.yml"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of processes used to extract hostnames, 0 uses all "
+             "CPUs; overrides processing.workers in the configuration file"
+    )
+
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="only download systems whose last download attempt failed"
+    )
+
+    parser.add_argument(
+        "--export-format",
+        choices=list(export.EXPORT_FORMATS),
+        default=export.DEFAULT_FORMAT,
+        help="format of the consolidated inventory; parquet and arrow "
+             "require pyarrow, default is csv"
+    )
+
     args = parser.parse_args()
-    main(args.skip_download, args.config)
+    main(args.skip_download, args.config, args.workers, args.retry_failed,
+         args.export_format)
@@ -0,0 +1,249 @@
+"""Download hardware inventory appendices directly over HTTP
+
+After logging in with the browser, the authenticated cookies are copied into
+a pooled requests session. The appendix URL is resolved from the HTML of the
+system and appendices pages, and the file is streamed straight to disk,
+avoiding the page navigations and clicks needed to reach it in the browser.
+"""
+
+import re
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urljoin, urlparse
+
+import requests
+
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from .log import LoggingBase
+
+# size of chunks written to disk while streaming a download
+CHUNK_SIZE = 64 * 1024
+
+FILENAME_REGEX = re.compile(
+    r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', re.IGNORECASE
+)
+
+
+class DirectDownloadError(Exception):
+    """Raised when an appendix cannot be downloaded without the browser"""
+
+
+class AppendixDownloader(LoggingBase):
+    """Download appendices using cookies from an authenticated browser"""
+
+    def __init__(self, config: Dict, cookies: List[Dict],
+                 appendices_selector: str, appendix_link_id: str,
+                 user_agent: Optional[str] = None) -> None:
+        """Initialize an instance of the AppendixDownloader class
+
+        Parameters
+        ----------
+        config: Dict
+            dictionary containing configuration data; csam.system_url must be
+            a URL, relative to csam.base_url, of a system's page with a
+            {system_id} placeholder
+
+        cookies: List[Dict]
+            cookies from the logged in browser, as returned by the WebDriver
+            get_cookies method
+
+        appendices_selector: str
+            CSS selector of the link to the appendices page on a system page
+
+        appendix_link_id: str
+            id of the hardware inventory link on the appendices page
+
+        user_agent: str
+            user agent of the browser, sent with each request if specified
+        """
+        super().__init__()
+        self._base_url = str(config['csam']['base_url'])
+        self._system_url = config['csam']['system_url']
+        self._timeout = config['scraping'].get('download_timeout', 60)
+        self._appendices_selector = appendices_selector
+        self._appendix_link_id = appendix_link_id
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                              max_retries=2)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        if user_agent:
+            self._session.headers['User-Agent'] = user_agent
+
+        for cookie in cookies:
+            self._session.cookies.set(cookie['name'], cookie['value'],
+                                      domain=cookie.get('domain', ''),
+                                      path=cookie.get('path', '/'))
+
+    def _get_page(self, url: str) -> BeautifulSoup:
+        """Request a page and parse its HTML
+
+        Parameters
+        ----------
+        url: str
+            absolute URL of the page
+
+        Returns
+        -------
+        BeautifulSoup
+            the parsed page
+        """
+        response = self._session.get(url, timeout=self._timeout)
+        response.raise_for_status()
+        return BeautifulSoup(response.text, features="html5lib")
+
+    @staticmethod
+    def _link_target(page_url: str, link) -> Optional[str]:
+        """Resolve the absolute URL a link points to
+
+        Parameters
+        ----------
+        page_url: str
+            URL of the page containing the link
+
+        link: bs4.element.Tag
+            anchor element, possibly None
+
+        Returns
+        -------
+        str
+            the absolute URL, or None if the link does not navigate to a URL
+            (for example, an ASP.NET postback)
+        """
+        if link is None:
+            return None
+
+        href = link.get('href', '').strip()
+
+        if not href or href.lower().startswith('javascript:'):
+            return None
+
+        return urljoin(page_url, href)
+
+    def resolve_appendix_url(self, system_id: int) -> Optional[str]:
+        """Find the URL of a system's hardware inventory appendix
+
+        Parameters
+        ----------
+        system_id: int
+            ID of the system
+
+        Returns
+        -------
+        str
+            the URL of the appendix, or None if the system has no hardware
+            inventory appendix
+        """
+        system_url = urljoin(self._base_url,
+                             self._system_url.format(system_id=system_id))
+        system_page = self._get_page(system_url)
+
+        appendices_url = self._link_target(
+            system_url,
+            system_page.select_one(self._appendices_selector)
+        )
+
+        if appendices_url is None:
+            raise DirectDownloadError(
+                f"No appendices link on the page for system {system_id}."
+            )
+
+        appendices_page = self._get_page(appendices_url)
+        appendix_link = appendices_page.find(id=self._appendix_link_id)
+
+        if appendix_link is None:
+            return None
+
+        appendix_url = self._link_target(appendices_url, appendix_link)
+
+        if appendix_url is None:
+            raise DirectDownloadError(
+                f"Appendix link for system {system_id} is not a plain link."
+            )
+
+        return appendix_url
+
+    def download(self, system_id: int, output_path: Path) -> Optional[Path]:
+        """Download a system's hardware inventory appendix
+
+        Parameters
+        ----------
+        system_id: int
+            ID of the system
+
+        output_path: Path
+            directory in which the file is saved, named
+            hw-inventory-ID.SUFFIX
+
+        Returns
+        -------
+        Path
+            location of the downloaded file, or None if the system has no
+            hardware inventory appendix; DirectDownloadError or a
+            requests.RequestException is raised if the download fails
+        """
+        appendix_url = self.resolve_appendix_url(system_id)
+
+        if appendix_url is None:
+            return None
+
+        with self._session.get(appendix_url, stream=True,
+                               timeout=self._timeout) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+
+            # an HTML response is usually a login or error page
+            if content_type.startswith('text/html'):
+                raise DirectDownloadError(
+                    f"Appendix for system {system_id} returned HTML."
+                )
+
+            suffix = self._file_suffix(response)
+            file_path = Path(output_path) / f"hw-inventory-{system_id}{suffix}"
+            partial_path = file_path.with_name(file_path.name + ".part")
+
+            try:
+                with open(partial_path, 'wb') as out_file:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        out_file.write(chunk)
+
+                partial_path.replace(file_path)
+
+            finally:
+                if partial_path.exists():
+                    partial_path.unlink()
+
+        self.logger.debug("Downloaded %s to %s.", appendix_url, file_path)
+        return file_path
+
+    @staticmethod
+    def _file_suffix(response: requests.Response) -> str:
+        """Determine the file extension of a downloaded appendix
+
+        Parameters
+        ----------
+        response: requests.Response
+            response for the appendix request
+
+        Returns
+        -------
+        str
+            the extension, with a leading period, from the
+            Content-Disposition header or else the URL
+        """
+        disposition = response.headers.get('Content-Disposition', '')
+        match = FILENAME_REGEX.search(disposition)
+
+        if match:
+            return Path(unquote(match.group(1))).suffix.lower()
+
+        return Path(unquote(urlparse(response.url).path)).suffix.lower()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self._session.close()
@@ -0,0 +1,188 @@
+"""Persistent cache of hostname extraction results
+
+Results are keyed on the file name, the SHA-256 of the file contents and a
+version derived from the extraction code, so a file is only re-extracted when
+its bytes or the extraction rules change. The file name is part of the key
+because some rules (UNIQUE_HEADERS, EXCLUDE_HEADERS_BY_FILE) depend on it.
+"""
+
+import hashlib
+import json
+import sqlite3
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import extract
+from .log import LoggingBase
+
+CACHE_FILE_NAME = "extraction-cache.sqlite"
+
+# size of blocks read when hashing files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path: str) -> str:
+    """Compute the SHA-256 digest of a file
+
+    Parameters
+    ----------
+    file_path: str
+        path to the file
+
+    Returns
+    -------
+    str
+        hexadecimal digest of the file contents
+    """
+    digest = hashlib.sha256()
+
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def extractor_version() -> str:
+    """Compute a version identifier for the extraction code
+
+    The identifier is a digest of the source of the modules that extract
+    hostnames and of the registered extractors, so changes to headers,
+    exclusion lists, cleaning rules or the selected Word backend invalidate
+    cached results without a manual version bump.
+
+    Returns
+    -------
+    str
+        hexadecimal digest of the extraction source code and configuration
+    """
+    package_path = Path(__file__).parent
+    sources = [package_path / "extract.py",
+               *sorted((package_path / "data_extraction").glob("*.py"))]
+
+    digest = hashlib.sha256()
+
+    for source in sources:
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+
+    digest.update(extract.describe_extractors().encode())
+
+    return digest.hexdigest()
+
+
+def default_cache_path(config: Dict) -> Path:
+    """Determine the location of the cache database
+
+    Parameters
+    ----------
+    config: Dict
+        dictionary with configuration data
+
+    Returns
+    -------
+    Path
+        the configured processing.cache_path, or a file next to the download
+        path if not configured
+    """
+    cache_path = config.get('processing', {}).get('cache_path')
+
+    if cache_path:
+        return Path(cache_path)
+
+    download_path = Path(config['scraping']['download_path']).resolve()
+    return download_path.parent / CACHE_FILE_NAME
+
+
+class ExtractionCache(LoggingBase):
+    """SQLite-backed store of hostnames extracted from inventory files"""
+
+    def __init__(self, cache_path: Path,
+                 version: Optional[str] = None) -> None:
+        """Initialize an instance of the ExtractionCache class
+
+        Parameters
+        ----------
+        cache_path: Path
+            location of the SQLite database, created if necessary
+
+        version: str
+            version of the extraction code; defaults to extractor_version()
+        """
+        super().__init__()
+        self._version = version or extractor_version()
+        self._connection = sqlite3.connect(str(cache_path))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " file_name TEXT NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " version TEXT NOT NULL,"
+            " hostnames TEXT NOT NULL,"
+            " PRIMARY KEY (file_name, sha256, version))"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_name: str, digest: str) -> Optional[List[str]]:
+        """Look up the hostnames previously extracted from a file
+
+        Parameters
+        ----------
+        file_name: str
+            name of the file, without directories
+
+        digest: str
+            SHA-256 digest of the file contents
+
+        Returns
+        -------
+        List[str] or None
+            the cached hostnames, or None if the file has not been extracted
+            with the current version of the extraction code
+        """
+        row = self._connection.execute(
+            "SELECT hostnames FROM extractions"
+            " WHERE file_name = ? AND sha256 = ? AND version = ?",
+            (file_name, digest, self._version)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, file_name: str, digest: str, hostnames: List[str]) -> None:
+        """Store the hostnames extracted from a file
+
+        Parameters
+        ----------
+        file_name: str
+            name of the file, without directories
+
+        digest: str
+            SHA-256 digest of the file contents
+
+        hostnames: List[str]
+            hostnames extracted from the file
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extractions"
+                " (file_name, sha256, version, hostnames)"
+                " VALUES (?, ?, ?, ?)",
+                (file_name, digest, self._version, json.dumps(hostnames))
+            )
+
+    def prune(self) -> None:
+        """Remove entries created by other versions of the extraction code"""
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM extractions WHERE version != ?", (self._version,)
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._connection.close()
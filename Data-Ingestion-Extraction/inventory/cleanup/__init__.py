@@ -0,0 +1,4 @@
+"""The files/modules in this folder/package contain the code used to combine
+and clean up the hardware inventory workbooks collected from CSAM before
+hostnames are generated from them.
+"""
@@ -0,0 +1,72 @@
+"""Make sure the header of each sheet has every column of its template
+
+Sheets whose header lacks some of the template's columns, usually because a
+system deleted columns it did not use, get the missing column names appended
+to the header so that every sheet of a template has the same columns.
+"""
+
+from typing import Dict, List, Sequence
+
+from .sheets import Sheet
+from .templates import V2_0_TEMPLATE, V2_3_TEMPLATE
+
+# columns of each template version, in template order
+EXPECTED_COLUMNS = {
+    V2_3_TEMPLATE: [
+        'Identifier or Host Name', 'IP Address (Internal)',
+        'IP Address (External)', 'NAT IPs', 'AD Domain', 'CPU Core',
+        'Memory (GB)', 'Drive Space (GB)', 'OS Name', 'OS Version',
+        'Lifecycle', 'Location', 'Hosting/CSP Contract', 'Asset Category',
+        'Asset Type', 'Virtual', 'Hardware Make', 'Hardware Model',
+        'Manufacturer Serial Number', 'BIOS UUID/GUID', 'MAC Address(es)',
+        'Public', 'High Value Asset', 'GFE',
+        'Date Device Added to System Boundary',
+        'System Owner / Device Manager', 'Device Operator',
+        'Primary System Boundary CSAM Acronym',
+        'Primary System Boundary CSAM ID', 'Systems Supported CSAM Acronym',
+        'System Supported CSAM ID', 'First Tier Supplier',
+    ],
+    V2_0_TEMPLATE: [
+        'IP Address (Internal)', 'IP Address (External)', 'NAT IPs',
+        'Identifier or Host Name', 'AD Domain', 'CPU Core', 'Memory (GB)',
+        'Drive Space (GB)', 'OS Name', 'OS Version', 'Lifecycle', 'Location',
+        'Hosting/CSP Contract', 'Asset Category', 'Asset Type', 'Virtual',
+        'Hardware Make', 'Hardware Model', 'Manufacturer Serial Number',
+        'BIOS UUID/GUID', 'MAC Address(es)', 'Public', 'High Value Asset',
+        'GFE', 'Date Device Added to System Boundary',
+        'System Owner / Device Manager', 'Device Operator',
+        'Systems Supported',
+    ],
+}  # type: Dict[str, List[str]]
+
+
+def insert_missing_columns(sheet: Sheet,
+                           expected_columns: Sequence[str]) -> List[str]:
+    """Append the expected columns missing from the first row of a sheet
+
+    Missing column names are placed after the last column in use anywhere in
+    the sheet, so they never land on top of existing data.
+
+    Parameters
+    ----------
+    sheet: Sheet
+        sheet whose first row is its header; it is modified in place
+
+    expected_columns: Sequence[str]
+        names of the columns the header should have
+
+    Returns
+    -------
+    List[str]
+        names of the columns that were added, possibly an empty list
+    """
+    first_row = sheet.rows[0] if sheet.rows else ()
+    missing_columns = [x for x in expected_columns if x not in first_row]
+
+    if missing_columns:
+        width = max(len(x) for x in sheet.rows) if sheet.rows else 0
+        padding = (None,) * (width - len(first_row))
+        header = tuple(first_row) + padding + tuple(missing_columns)
+        sheet.rows[:1] = [header]
+
+    return missing_columns
@@ -0,0 +1,249 @@
+"""Combine many hardware inventory workbooks into one
+
+Each source workbook becomes one sheet of the combined workbook, named after
+the file. Source workbooks are read in worker processes, in parallel, and
+their sheets are written to the combined workbook in file order as soon as
+they arrive, so only the sheets in flight are held in memory.
+"""
+
+import logging
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, Iterator, List, Tuple
+
+from ..data_extraction.readers import DEFAULT_ENGINE
+from ..processing import resolve_workers
+from .sheets import Sheet, read_sheets, write_sheets
+
+
+def find_workbooks(directory: str) -> List[str]:
+    """Find the .xlsx workbooks in a directory and its subdirectories
+
+    Parameters
+    ----------
+    directory: str
+        directory to search
+
+    Returns
+    -------
+    List[str]
+        absolute paths of the workbooks, sorted
+    """
+    file_paths = []
+
+    for root, _, filenames in os.walk(directory):
+        for file in filenames:
+            if file.endswith('.xlsx'):
+                file_paths.append(os.path.abspath(os.path.join(root, file)))
+
+    return sorted(file_paths)
+
+
+def overlay_sheets(sheets: List[Sheet]) -> List[tuple]:
+    """Place the cells of several sheets on a single grid
+
+    Cells keep their positions, and a cell of a later sheet replaces a cell
+    of an earlier sheet at the same position unless it is empty.
+
+    Parameters
+    ----------
+    sheets: List[Sheet]
+        sheets to combine
+
+    Returns
+    -------
+    List[tuple]
+        values of the cells of each row of the combined grid
+    """
+    if len(sheets) == 1:
+        return sheets[0].rows
+
+    grid = []  # type: List[list]
+
+    for sheet in sheets:
+        for row_index, row in enumerate(sheet.rows):
+            if row_index == len(grid):
+                grid.append([])
+
+            cells = grid[row_index]
+
+            if len(cells) < len(row):
+                cells.extend([None] * (len(row) - len(cells)))
+
+            for column_index, value in enumerate(row):
+                if value is not None:
+                    cells[column_index] = value
+
+    return [tuple(x) for x in grid]
+
+
+def combine_file(file_path: str, engine: str = DEFAULT_ENGINE,
+                 exclude_sheets: Collection[str] = (),
+                 formulas: bool = False) -> Tuple[Sheet, float]:
+    """Read a workbook into a single sheet named after the file
+
+    This function is used as the unit of work for worker processes, so it must
+    remain a module level function that can be pickled.
+
+    Parameters
+    ----------
+    file_path: str
+        path to the workbook
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    exclude_sheets: Collection[str]
+        names of worksheets to leave out, see sheets.read_sheets
+
+    formulas: bool
+        whether to keep formulas rather than their cached values, see
+        sheets.read_sheets
+
+    Returns
+    -------
+    Sheet, float
+        the combined sheet and the time in seconds spent reading it
+    """
+    start = time.perf_counter()
+    sheet_name = os.path.basename(file_path).split('.')[0]
+    rows = overlay_sheets(read_sheets(file_path, engine, exclude_sheets,
+                                      formulas))
+
+    return Sheet(sheet_name, rows), time.perf_counter() - start
+
+
+def iter_combined(file_paths: List[str], workers: int = 1,
+                  engine: str = DEFAULT_ENGINE,
+                  exclude_sheets: Collection[str] = (),
+                  formulas: bool = False) -> Iterator[Sheet]:
+    """Read workbooks into sheets named after the files
+
+    Parameters
+    ----------
+    file_paths: List[str]
+        paths to the workbooks
+
+    workers: int
+        number of worker processes; values less than 1 use one worker per
+        available CPU, and with a single worker, workbooks are read serially
+        in the current process
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    exclude_sheets: Collection[str]
+        names of worksheets to leave out, see sheets.read_sheets
+
+    formulas: bool
+        whether to keep formulas rather than their cached values, see
+        sheets.read_sheets
+
+    Returns
+    -------
+    Iterator[Sheet]
+        one sheet per workbook, in the order of file_paths
+    """
+    workers = resolve_workers(workers)
+
+    if workers == 1 or len(file_paths) < 2:
+        results = (combine_file(x, engine, exclude_sheets, formulas)
+                   for x in file_paths)
+
+        for sheet, elapsed in results:
+            _log_throughput(sheet, elapsed)
+            yield sheet
+
+        return
+
+    logging.info("Reading %d workbooks with %d workers.", len(file_paths),
+                 workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # submit a few files ahead of the one being written so workers stay
+        # busy without every sheet waiting in memory
+        window = 2 * workers
+        futures = [executor.submit(combine_file, x, engine, exclude_sheets,
+                                   formulas)
+                   for x in file_paths[:window]]
+
+        for index in range(len(file_paths)):
+            sheet, elapsed = futures[index].result()
+            futures[index] = None
+
+            if index + window < len(file_paths):
+                futures.append(executor.submit(
+                    combine_file, file_paths[index + window], engine,
+                    exclude_sheets, formulas
+                ))
+
+            _log_throughput(sheet, elapsed)
+            yield sheet
+
+
+def _log_throughput(sheet: Sheet, elapsed: float) -> None:
+    """Log the time taken to read a workbook
+
+    Parameters
+    ----------
+    sheet: Sheet
+        sheet read from the workbook
+
+    elapsed: float
+        seconds spent reading the workbook
+    """
+    logging.info("File: %s Rows: %d Time Elapsed: %.4f secs (%.0f rows/sec)",
+                 sheet.name, len(sheet.rows), elapsed,
+                 len(sheet.rows) / elapsed if elapsed else 0)
+
+
+def combine_workbooks(file_paths: List[str], output_path: str,
+                      workers: int = 1, engine: str = DEFAULT_ENGINE,
+                      exclude_sheets: Collection[str] = (),
+                      formulas: bool = False) -> int:
+    """Combine workbooks into a new workbook with one sheet per file
+
+    Parameters
+    ----------
+    file_paths: List[str]
+        paths to the workbooks
+
+    output_path: str
+        path of the combined workbook to create
+
+    workers: int
+        number of worker processes reading workbooks; values less than 1 use
+        one worker per available CPU
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    exclude_sheets: Collection[str]
+        names of worksheets to leave out, such as sheets.REFERENCE_SHEETS;
+        they are skipped when each workbook is read, so source workbooks are
+        never modified
+
+    formulas: bool
+        whether to copy formulas rather than the values cached when each
+        workbook was last saved, see sheets.read_sheets
+
+    Returns
+    -------
+    int
+        number of rows written
+    """
+    start = time.perf_counter()
+    row_count = write_sheets(
+        iter_combined(file_paths, workers, engine, exclude_sheets,
+                      formulas),
+        output_path
+    )
+    elapsed = time.perf_counter() - start
+
+    logging.info("Combined %d workbooks (%d rows) into %s in %.2f secs "
+                 "(%.0f rows/sec).", len(file_paths), row_count, output_path,
+                 elapsed, row_count / elapsed if elapsed else 0)
+
+    return row_count
@@ -0,0 +1,337 @@
+"""Run the workbook cleanup steps in a single process
+
+A pipeline is a list of stages, each a named transform over a set of
+in-memory workbooks: a dictionary mapping a workbook key, such as 'combined'
+or 'V2.3', to its sheets. Source workbooks are read once by the first stage,
+the stages transform the sheets in memory, and the resulting workbooks are
+written once at the end, instead of every step reloading and saving a large
+workbook. The time spent in each stage is recorded.
+"""
+
+import logging
+import time
+
+from typing import (Callable, Collection, Dict, List, Optional, Sequence,
+                    Tuple)
+
+from ..data_extraction.readers import DEFAULT_ENGINE
+from ..log import LoggingBase
+from .columns import EXPECTED_COLUMNS, insert_missing_columns
+from .combine import iter_combined
+from .rows import ROW_FILTERS, RowFilter, filter_rows, has_expected_header
+from .sheets import REFERENCE_SHEETS, Sheet, write_sheets
+from .templates import (HEADER_ROWS, OLD_TEMPLATE, V2_0_TEMPLATE,
+                        V2_3_TEMPLATE, classify)
+
+Workbooks = Dict[str, List[Sheet]]
+
+COMBINED = 'combined'
+
+# workbooks written by the default pipeline, the final outputs of the
+# scripts it replaces
+OUTPUT_PATHS = {
+    V2_3_TEMPLATE: 'CorrectedCombinedFile-CSAMTemplate.xlsx',
+    V2_0_TEMPLATE: 'CorrectedCombinedFile-NewTemplate.xlsx',
+    OLD_TEMPLATE: 'Raw-CombinedFile-OldTemplate.xlsx',
+}
+
+
+class Stage:
+    """A named step of a pipeline"""
+
+    def __init__(self, name: str,
+                 transform: Callable[[Workbooks], Workbooks]) -> None:
+        """Initialize an instance of the Stage class
+
+        Parameters
+        ----------
+        name: str
+            name of the stage, used when reporting timings
+
+        transform: Callable[[Workbooks], Workbooks]
+            function that takes the workbooks produced by the previous stage
+            and returns the workbooks for the next stage; it may modify its
+            argument
+        """
+        self.name = name
+        self.transform = transform
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r})"
+
+
+class Pipeline(LoggingBase):
+    """Apply stages to in-memory workbooks in order, timing each"""
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        """Initialize an instance of the Pipeline class
+
+        Parameters
+        ----------
+        stages: Sequence[Stage]
+            stages to run, in order
+        """
+        super().__init__()
+        self.stages = list(stages)
+        self.timings = []  # type: List[Tuple[str, float]]
+
+    def run(self, workbooks: Optional[Workbooks] = None) -> Workbooks:
+        """Run every stage
+
+        Parameters
+        ----------
+        workbooks: Workbooks
+            workbooks given to the first stage; default: none
+
+        Returns
+        -------
+        Workbooks
+            the workbooks returned by the last stage
+        """
+        workbooks = workbooks if workbooks is not None else {}
+        self.timings = []
+
+        for stage in self.stages:
+            self.logger.info("Running stage %s.", stage.name)
+            start = time.perf_counter()
+            workbooks = stage.transform(workbooks)
+            elapsed = time.perf_counter() - start
+
+            self.timings.append((stage.name, elapsed))
+            self.logger.info("Stage %s took %.2f secs; %d sheets, %d rows.",
+                             stage.name, elapsed,
+                             sum(len(x) for x in workbooks.values()),
+                             sum(len(y.rows) for x in workbooks.values()
+                                 for y in x))
+
+        return workbooks
+
+    def log_timings(self) -> None:
+        """Log the time spent in each stage of the last run, slowest first"""
+        total = sum(x for _, x in self.timings)
+
+        for name, elapsed in sorted(self.timings, key=lambda x: x[1],
+                                    reverse=True):
+            self.logger.info("%-30s %8.2f secs %5.1f%%", name, elapsed,
+                             100 * elapsed / total if total else 0)
+
+        self.logger.info("%-30s %8.2f secs", "total", total)
+
+
+def combine_stage(file_paths: List[str], workers: int = 1,
+                  engine: str = DEFAULT_ENGINE,
+                  exclude_sheets: Collection[str] = REFERENCE_SHEETS,
+                  target: str = COMBINED) -> Stage:
+    """Read workbooks into one sheet per file, see combine.iter_combined
+
+    Parameters
+    ----------
+    file_paths: List[str]
+        paths to the workbooks
+
+    workers: int
+        number of worker processes reading workbooks
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    exclude_sheets: Collection[str]
+        names of worksheets to leave out
+
+    target: str
+        key of the workbook holding the combined sheets
+
+    Returns
+    -------
+    Stage
+        the stage
+    """
+    def transform(workbooks: Workbooks) -> Workbooks:
+        workbooks[target] = list(iter_combined(file_paths, workers, engine,
+                                               exclude_sheets))
+        return workbooks
+
+    return Stage("combine", transform)
+
+
+def separate_stage(source: str = COMBINED,
+                   header_rows: int = HEADER_ROWS) -> Stage:
+    """Move each sheet into a workbook keyed by its template version name,
+    see templates.classify
+
+    Parameters
+    ----------
+    source: str
+        key of the workbook to separate; it is removed
+
+    header_rows: int
+        number of rows at the top of each sheet examined
+
+    Returns
+    -------
+    Stage
+        the stage
+    """
+    def transform(workbooks: Workbooks) -> Workbooks:
+        for sheet in workbooks.pop(source, []):
+            template = classify(sheet.rows, header_rows)
+
+            if template is None:
+                logging.info("Sheet: %s does not match a template.",
+                             sheet.name)
+                continue
+
+            workbooks.setdefault(template.name, []).append(sheet)
+
+        return workbooks
+
+    return Stage("separate", transform)
+
+
+def delete_rows_stage(key: str, row_filter: RowFilter) -> Stage:
+    """Remove the rows selected by a filter from each sheet of a workbook,
+    see rows.RowFilter
+
+    Parameters
+    ----------
+    key: str
+        key of the workbook to clean up
+
+    row_filter: RowFilter
+        filter selecting the rows to remove
+
+    Returns
+    -------
+    Stage
+        the stage
+    """
+    def transform(workbooks: Workbooks) -> Workbooks:
+        for sheet in workbooks.get(key, []):
+            filter_rows(sheet, row_filter)
+
+            if not has_expected_header(sheet):
+                logging.info("Sheet '%s' does not have any of the expected "
+                             "values in the first row.", sheet.name)
+
+        return workbooks
+
+    return Stage(f"delete rows ({key})", transform)
+
+
+def insert_columns_stage(key: str, expected_columns: Sequence[str]) -> Stage:
+    """Add missing columns to the header of each sheet of a workbook, see
+    columns.insert_missing_columns
+
+    Parameters
+    ----------
+    key: str
+        key of the workbook to fix
+
+    expected_columns: Sequence[str]
+        names of the columns each header should have
+
+    Returns
+    -------
+    Stage
+        the stage
+    """
+    def transform(workbooks: Workbooks) -> Workbooks:
+        for sheet in workbooks.get(key, []):
+            missing_columns = insert_missing_columns(sheet, expected_columns)
+
+            if missing_columns:
+                logging.info("Worksheet '%s' was missing columns: %s. They "
+                             "have been added.", sheet.name, missing_columns)
+
+        return workbooks
+
+    return Stage(f"insert columns ({key})", transform)
+
+
+def write_workbooks(workbooks: Workbooks,
+                    output_paths: Dict[str, str]) -> None:
+    """Write workbooks to disk
+
+    Parameters
+    ----------
+    workbooks: Workbooks
+        in-memory workbooks
+
+    output_paths: Dict[str, str]
+        path to write each workbook to, by key; workbooks without a path are
+        not written, and a workbook with a path but no sheets is written
+        empty
+    """
+    for key, output_path in output_paths.items():
+        row_count = write_sheets(workbooks.get(key, []), output_path)
+        logging.info("Saved %d rows to %s.", row_count, output_path)
+
+
+def write_stage(output_paths: Dict[str, str]) -> Stage:
+    """Write workbooks to disk, see write_workbooks
+
+    Parameters
+    ----------
+    output_paths: Dict[str, str]
+        path to write each workbook to, by key
+
+    Returns
+    -------
+    Stage
+        the stage; it passes the workbooks on unchanged
+    """
+    def transform(workbooks: Workbooks) -> Workbooks:
+        write_workbooks(workbooks, output_paths)
+        return workbooks
+
+    return Stage("write", transform)
+
+
+def default_pipeline(file_paths: List[str], workers: int = 1,
+                     engine: str = DEFAULT_ENGINE,
+                     output_paths: Optional[Dict[str, str]] = None,
+                     row_filters: Optional[Dict[str, RowFilter]] = None) -> \
+        Pipeline:
+    """Build the pipeline run by data/sequencialCleanup.py
+
+    The stages combine the inventory workbooks without their reference
+    sheets, separate the sheets by template version, remove the rows above
+    the header of V2.0 and V2.3 sheets, add any missing template columns to
+    their headers and write a workbook for each template version.
+
+    Parameters
+    ----------
+    file_paths: List[str]
+        paths to the inventory workbooks
+
+    workers: int
+        number of worker processes reading workbooks
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    output_paths: Dict[str, str]
+        path of the workbook written for each template version; default:
+        OUTPUT_PATHS
+
+    row_filters: Dict[str, RowFilter]
+        filter selecting the rows to remove from the V2.0 and V2.3 sheets, by
+        template version; default: rows.ROW_FILTERS
+
+    Returns
+    -------
+    Pipeline
+        the pipeline
+    """
+    row_filters = row_filters if row_filters is not None else ROW_FILTERS
+
+    return Pipeline([
+        combine_stage(file_paths, workers, engine),
+        separate_stage(),
+        delete_rows_stage(V2_0_TEMPLATE, row_filters[V2_0_TEMPLATE]),
+        delete_rows_stage(V2_3_TEMPLATE, row_filters[V2_3_TEMPLATE]),
+        insert_columns_stage(V2_3_TEMPLATE, EXPECTED_COLUMNS[V2_3_TEMPLATE]),
+        insert_columns_stage(V2_0_TEMPLATE, EXPECTED_COLUMNS[V2_0_TEMPLATE]),
+        write_stage(output_paths if output_paths is not None
+                    else OUTPUT_PATHS),
+    ])
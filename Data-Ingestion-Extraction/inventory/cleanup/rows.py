@@ -0,0 +1,178 @@
+"""Remove unwanted rows from sheets in a single pass
+
+Inventory templates put a title, guidance text and sometimes sample devices
+above the column header, and some inventories contain rows for devices that
+should not be reported. A RowFilter decides which rows to remove from a
+sheet: rows at given positions, and rows in which a cell contains one of a
+list of marker strings, optionally only near the top of the sheet. Every row
+is examined once and the surviving rows are collected into a new list, rather
+than deleting rows one at a time, which shifts every row below each deleted
+row. The markers are compiled into one PatternMatcher, so searching a row
+takes about as long however many markers there are.
+
+The marker strings for each template version are kept in ROW_MARKERS and can
+be changed there, or by passing other filters to the cleanup pipeline.
+"""
+
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
+
+from ..data_extraction.matching import PatternMatcher
+from .sheets import Sheet
+from .templates import HEADER_ROWS, V2_0_TEMPLATE, V2_3_TEMPLATE
+
+# text found in the rows to remove near the top of sheets of each template
+# version
+ROW_MARKERS = {
+    V2_0_TEMPLATE: ["EDUPTCVPP005", "FL-EDSW-01", "Hardware Inventory",
+                    "GUIDANCE", "Valid Values", "Mandatory or Optional"],
+    V2_3_TEMPLATE: ["Operating System Name", "bpvhxwviis271",
+                    "Hardware Inventory", "Critical"],
+}  # type: Dict[str, List[str]]
+
+# values expected in the first row of a sheet once the rows above the header
+# are removed
+HEADER_VALUES = ["IP Address (Internal)", "NAT IPs", "Identifier or Host Name",
+                 "CPU Core"]
+
+
+class RowFilter:
+    """Select the rows to remove from a sheet"""
+
+    def __init__(self, markers: Sequence[str] = (),
+                 row_numbers: Collection[int] = (),
+                 scan_rows: Optional[int] = HEADER_ROWS) -> None:
+        """Initialize an instance of the RowFilter class
+
+        Parameters
+        ----------
+        markers: Sequence[str]
+            rows in which the text of a non-empty cell contains one of these
+            strings are removed
+
+        row_numbers: Collection[int]
+            1-based positions of rows that are always removed
+
+        scan_rows: int
+            number of rows at the top of the sheet searched for markers;
+            None searches every row
+        """
+        self.markers = list(markers)
+        self.row_numbers = frozenset(row_numbers)
+        self.scan_rows = scan_rows
+
+        self._matcher = PatternMatcher(self.markers)
+
+    def __repr__(self) -> str:
+        return (f"RowFilter({self.markers!r}, {sorted(self.row_numbers)!r}, "
+                f"{self.scan_rows!r})")
+
+    def contains_marker(self, row: Sequence) -> bool:
+        """Check whether a cell of a row contains a marker string
+
+        Parameters
+        ----------
+        row: Sequence
+            values of the cells of the row
+
+        Returns
+        -------
+        bool
+            true if the text of a non-empty cell contains a marker
+        """
+        return self._matcher.search_cells(row)
+
+    def apply(self, rows: Sequence[tuple]) -> Tuple[List[tuple], int]:
+        """Remove the selected rows
+
+        Parameters
+        ----------
+        rows: Sequence[tuple]
+            values of the cells of each row, starting at the first row
+
+        Returns
+        -------
+        List[tuple], int
+            the remaining rows, in order, and the number of rows removed
+        """
+        # only rows that can be selected are examined; the rest are copied
+        # in one slice
+        examined = len(rows) if self.scan_rows is None else self.scan_rows
+        examined = max(examined, max(self.row_numbers, default=0))
+
+        kept = [row for row_number, row in enumerate(rows[:examined], 1)
+                if row_number not in self.row_numbers
+                and not self.contains_marker(row)]
+        kept.extend(rows[examined:])
+
+        return kept, len(rows) - len(kept)
+
+
+# filters applied to the sheets of each template version by the cleanup
+# pipeline
+ROW_FILTERS = {
+    name: RowFilter(markers) for name, markers in ROW_MARKERS.items()
+}  # type: Dict[str, RowFilter]
+
+
+def filter_rows(sheet: Sheet, row_filter: RowFilter) -> int:
+    """Remove the rows selected by a filter from a sheet
+
+    Parameters
+    ----------
+    sheet: Sheet
+        sheet to clean up; it is modified in place
+
+    row_filter: RowFilter
+        filter selecting the rows to remove
+
+    Returns
+    -------
+    int
+        number of rows removed
+    """
+    sheet.rows, removed = row_filter.apply(sheet.rows)
+    return removed
+
+
+def delete_marked_rows(sheet: Sheet, target_strings: Sequence[str],
+                       header_rows: int = HEADER_ROWS) -> int:
+    """Remove rows near the top of a sheet that contain marker strings
+
+    Parameters
+    ----------
+    sheet: Sheet
+        sheet to clean up; it is modified in place
+
+    target_strings: Sequence[str]
+        strings marking rows to remove
+
+    header_rows: int
+        number of rows at the top of the sheet to examine
+
+    Returns
+    -------
+    int
+        number of rows removed
+    """
+    return filter_rows(sheet, RowFilter(target_strings, scan_rows=header_rows))
+
+
+def has_expected_header(sheet: Sheet,
+                        values: Sequence[str] = HEADER_VALUES) -> bool:
+    """Check whether the first row of a sheet contains any expected value
+
+    Parameters
+    ----------
+    sheet: Sheet
+        sheet to check
+
+    values: Sequence[str]
+        values expected in the header
+
+    Returns
+    -------
+    bool
+        true if a cell of the first row equals one of the values
+    """
+    first_row = sheet.rows[0] if sheet.rows else ()
+    return any(x in values for x in first_row)
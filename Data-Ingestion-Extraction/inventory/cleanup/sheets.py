@@ -0,0 +1,163 @@
+"""In-memory sheets read from and written to workbooks
+
+A Sheet holds the cell values of a worksheet as a list of row tuples, which
+is all the cleanup steps need and far less than openpyxl's per-cell objects.
+Sheets are read with the workbook readers used for hostname extraction and
+written with openpyxl's write-only mode, which streams rows to disk instead
+of building the whole workbook in memory first. Sheets can be excluded by
+name when a workbook is read, so they are never parsed.
+"""
+
+import logging
+
+from typing import Collection, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+
+from ..data_extraction.readers import (CALAMINE_ENGINE, DEFAULT_ENGINE,
+                                       open_workbook)
+
+# sheets of the inventory templates that hold guidance and lists of valid
+# values rather than inventory
+REFERENCE_SHEETS = ['Device Type Reference', 'Lists',
+                    'Sample Hardware Inventory']
+
+
+class Sheet:
+    """Name and cell values of a worksheet"""
+
+    def __init__(self, name: str, rows: Optional[List[tuple]] = None) -> None:
+        """Initialize an instance of the Sheet class
+
+        Parameters
+        ----------
+        name: str
+            name of the worksheet
+
+        rows: List[tuple]
+            values of the cells of each row, starting at the first row; empty
+            cells are None
+        """
+        self.name = name
+        self.rows = rows if rows is not None else []
+
+    def __repr__(self) -> str:
+        return f"Sheet({self.name!r}, {len(self.rows)} rows)"
+
+
+def trim_rows(rows: Iterable[Sequence]) -> List[tuple]:
+    """Drop empty cells from the end of each row and empty rows from the end
+    of a sheet
+
+    Parameters
+    ----------
+    rows: Iterable[Sequence]
+        values of the cells of each row
+
+    Returns
+    -------
+    List[tuple]
+        the rows, with empty rows in the middle of the sheet kept so that
+        every cell stays at the same position
+    """
+    trimmed = []
+    last_row = 0
+
+    for row in rows:
+        row = tuple(row)
+        end = len(row)
+
+        while end and row[end - 1] is None:
+            end -= 1
+
+        trimmed.append(row[:end])
+
+        if end:
+            last_row = len(trimmed)
+
+    del trimmed[last_row:]
+    return trimmed
+
+
+def read_sheets(file_path: str, engine: str = DEFAULT_ENGINE,
+                exclude_sheets: Collection[str] = (),
+                formulas: bool = False) -> List[Sheet]:
+    """Read the worksheets of a workbook
+
+    Parameters
+    ----------
+    file_path: str
+        path to the workbook
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    exclude_sheets: Collection[str]
+        names of worksheets to skip without reading them, such as
+        REFERENCE_SHEETS
+
+    formulas: bool
+        whether cells with formulas give their formulas, so that writing the
+        sheets keeps them, rather than the values cached when the workbook was
+        last saved; formula cells without a cached value are otherwise empty.
+        Formulas are read with openpyxl whatever the engine
+
+    Returns
+    -------
+    List[Sheet]
+        the worksheets that are not excluded, in workbook order
+    """
+    sheets = []
+
+    # every row is kept, so calamine loading whole sheets costs no extra
+    # memory; openpyxl streams rows so that it does not build cell objects
+    read_only = engine != CALAMINE_ENGINE
+
+    with open_workbook(file_path, engine, read_only=read_only,
+                       formulas=formulas) as workbook:
+        for sheet_name in workbook.sheet_names:
+            if sheet_name in exclude_sheets:
+                logging.info("Skipped %s sheet in %s.", sheet_name,
+                             file_path)
+                continue
+
+            sheets.append(Sheet(sheet_name,
+                                trim_rows(workbook.iter_rows(sheet_name))))
+
+    return sheets
+
+
+def write_sheets(sheets: Iterable[Sheet], output_path: str) -> int:
+    """Write sheets to a new workbook, one at a time
+
+    Parameters
+    ----------
+    sheets: Iterable[Sheet]
+        sheets to write; they can be produced lazily, since each is written
+        as soon as it is received
+
+    output_path: str
+        path of the workbook to create
+
+    Returns
+    -------
+    int
+        number of rows written
+    """
+    workbook = Workbook(write_only=True)
+    row_count = 0
+
+    for sheet in sheets:
+        worksheet = workbook.create_sheet(sheet.name)
+
+        for row in sheet.rows:
+            worksheet.append(row)
+
+        row_count += len(sheet.rows)
+
+    # an empty workbook cannot be saved
+    if not workbook.worksheets:
+        workbook.create_sheet()
+
+    workbook.save(output_path)
+    return row_count
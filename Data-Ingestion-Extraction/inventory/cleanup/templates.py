@@ -0,0 +1,276 @@
+"""Identify the inventory template version of each sheet
+
+Inventory workbooks have been submitted on several versions of the hardware
+inventory template, which differ in their columns. A template version is
+recognized by text that appears in its header, such as 'BIOS UUID', which
+the old template does not have. Only the first rows of a sheet, where the
+header is, are examined: their text is joined into a single fingerprint
+string, which is searched once for the required columns of every version.
+The first version, most specific first, whose required columns were all
+found is chosen.
+"""
+
+import functools
+import logging
+import time
+
+from typing import (Collection, Dict, FrozenSet, Iterable, List, Optional,
+                    Sequence)
+
+from openpyxl import Workbook
+
+from ..data_extraction.matching import PatternMatcher
+from ..data_extraction.readers import DEFAULT_ENGINE, open_workbook
+
+# number of rows at the top of a sheet searched for the header; the header is
+# preceded by at most a few rows of title and guidance text
+HEADER_ROWS = 10
+
+V2_3_TEMPLATE = 'V2.3'
+V2_0_TEMPLATE = 'V2.0'
+OLD_TEMPLATE = 'old'
+
+
+class TemplateVersion:
+    """A version of the hardware inventory template"""
+
+    def __init__(self, name: str, required_columns: Sequence[str]) -> None:
+        """Initialize an instance of the TemplateVersion class
+
+        Parameters
+        ----------
+        name: str
+            name of the version, such as 'V2.3'
+
+        required_columns: Sequence[str]
+            text found in the header of this version, and not all found in
+            the header of any less specific version; a version without
+            required columns matches every sheet
+        """
+        self.name = name
+        self.required_columns = list(required_columns)
+
+    def __repr__(self) -> str:
+        return f"TemplateVersion({self.name!r}, {self.required_columns!r})"
+
+    def matches(self, fingerprint: str) -> bool:
+        """Check whether a header fingerprint has all required columns
+
+        Parameters
+        ----------
+        fingerprint: str
+            header fingerprint from header_fingerprint
+
+        Returns
+        -------
+        bool
+            true if every required column appears in the fingerprint
+        """
+        return self.has_columns(header_matcher([self]).find_all(fingerprint))
+
+    def has_columns(self, found: Collection[str]) -> bool:
+        """Check whether all required columns are among those found in a
+        header
+
+        Parameters
+        ----------
+        found: Collection[str]
+            columns found in the header, see header_matcher
+
+        Returns
+        -------
+        bool
+            true if every required column was found
+        """
+        return all(x in found for x in self.required_columns)
+
+
+@functools.lru_cache(maxsize=None)
+def _columns_matcher(columns: FrozenSet[str]) -> PatternMatcher:
+    return PatternMatcher(sorted(columns))
+
+
+def header_matcher(templates: Iterable[TemplateVersion]) -> PatternMatcher:
+    """Compile the required columns of template versions into one matcher;
+    the matcher is built once for each set of columns
+
+    Parameters
+    ----------
+    templates: Iterable[TemplateVersion]
+        template versions
+
+    Returns
+    -------
+    PatternMatcher
+        matcher finding the required columns of every version
+    """
+    return _columns_matcher(frozenset(y for x in templates
+                                      for y in x.required_columns))
+
+
+# registered template versions, most specific first
+TEMPLATES = []  # type: List[TemplateVersion]
+
+
+def register_template(name: str, required_columns: Sequence[str]) -> None:
+    """Register a template version, replacing any version with the same name
+
+    Versions are tried in order of decreasing number of required columns, so
+    a version that adds columns to another is tried before it.
+
+    Parameters
+    ----------
+    name: str
+        name of the version
+
+    required_columns: Sequence[str]
+        text found in the header of this version
+    """
+    TEMPLATES[:] = [x for x in TEMPLATES if x.name != name]
+    TEMPLATES.append(TemplateVersion(name, required_columns))
+    TEMPLATES.sort(key=lambda x: len(x.required_columns), reverse=True)
+
+
+register_template(V2_3_TEMPLATE,
+                  ['BIOS UUID', 'Systems Supported CSAM Acronym'])
+register_template(V2_0_TEMPLATE, ['BIOS UUID'])
+register_template(OLD_TEMPLATE, [])
+
+
+def header_fingerprint(rows: Iterable[Sequence],
+                       header_rows: int = HEADER_ROWS) -> str:
+    """Join the text of the first rows of a sheet into one string
+
+    Parameters
+    ----------
+    rows: Iterable[Sequence]
+        values of the cells of each row, starting at the first row; only the
+        first header_rows rows are consumed
+
+    header_rows: int
+        number of rows to include
+
+    Returns
+    -------
+    str
+        the text of every non-empty cell, one cell per line
+    """
+    tokens = []
+
+    for row_index, row in enumerate(rows, 1):
+        tokens.extend(str(x) for x in row if x is not None)
+
+        if row_index >= header_rows:
+            break
+
+    return '\n'.join(tokens)
+
+
+def classify(rows: Iterable[Sequence], header_rows: int = HEADER_ROWS,
+             templates: Optional[List[TemplateVersion]] = None) -> \
+        Optional[TemplateVersion]:
+    """Identify the template version of a sheet
+
+    Parameters
+    ----------
+    rows: Iterable[Sequence]
+        values of the cells of each row, starting at the first row
+
+    header_rows: int
+        number of rows at the top of the sheet to examine
+
+    templates: List[TemplateVersion]
+        versions to try, in order; default: TEMPLATES
+
+    Returns
+    -------
+    TemplateVersion
+        the first version whose required columns are all in the header, or
+        None if there is none
+    """
+    templates = templates if templates is not None else TEMPLATES
+    fingerprint = header_fingerprint(rows, header_rows)
+    found = header_matcher(templates).find_all(fingerprint)
+
+    for template in templates:
+        if template.has_columns(found):
+            return template
+
+    return None
+
+
+def separate_templates(source_path: str, output_paths: Dict[str, str],
+                       engine: str = DEFAULT_ENGINE,
+                       header_rows: int = HEADER_ROWS) -> Dict[str, int]:
+    """Copy each sheet of a workbook to the workbook for its template version
+
+    The source workbook is read once. Each sheet is classified from its first
+    rows and then streamed into the write-only workbook for its version.
+
+    Parameters
+    ----------
+    source_path: str
+        path to the workbook to separate, such as a combined workbook
+
+    output_paths: Dict[str, str]
+        path of the workbook to create for each template version name; sheets
+        of other versions, or of no registered version, are skipped
+
+    engine: str
+        workbook reader engine, see data_extraction.readers
+
+    header_rows: int
+        number of rows at the top of each sheet to examine
+
+    Returns
+    -------
+    Dict[str, int]
+        number of sheets written for each template version name
+    """
+    start = time.perf_counter()
+    workbooks = {x: Workbook(write_only=True) for x in output_paths}
+    counts = {x: 0 for x in output_paths}
+
+    with open_workbook(source_path, engine, read_only=True) as source:
+        for sheet_name in source.sheet_names:
+            rows = source.iter_rows(sheet_name)
+            header = []
+
+            # keep the rows consumed by the fingerprint to write them later
+            for row in rows:
+                header.append(row)
+
+                if len(header) >= header_rows:
+                    break
+
+            template = classify(header, header_rows)
+
+            if template is None or template.name not in workbooks:
+                logging.info("Sheet: %s skipped, template %s.", sheet_name,
+                             template.name if template else "unknown")
+                continue
+
+            worksheet = workbooks[template.name].create_sheet(sheet_name)
+
+            for row in header:
+                worksheet.append(row)
+
+            for row in rows:
+                worksheet.append(row)
+
+            counts[template.name] += 1
+            logging.info("Sheet: %s Template: %s", sheet_name, template.name)
+
+    for name, workbook in workbooks.items():
+        # an empty workbook cannot be saved
+        if not workbook.worksheets:
+            workbook.create_sheet()
+
+        workbook.save(output_paths[name])
+        logging.info("Saved %d %s sheets to %s.", counts[name], name,
+                     output_paths[name])
+
+    logging.info("Separated %s in %.2f secs.", source_path,
+                 time.perf_counter() - start)
+
+    return counts
@@ -1,22 +1,28 @@
 """Primary CSAM-related functionality for scraping"""
 import logging
-import os
-import time
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
 import pandas as pd
+import requests
 
 from bs4 import BeautifulSoup
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import (StaleElementReferenceException,
+                                        WebDriverException)
 from selenium.webdriver import ChromeOptions
 from splinter import Browser
 from splinter.driver.webdriver import WebDriverElement
 
+from csam_inventory.appendix import AppendixDownloader, DirectDownloadError
+from csam_inventory.downloads import DownloadWatcher, move_download
 from csam_inventory.log import LoggingBase
+from csam_inventory.manifest import (DOWNLOADED, FAILED, NO_INVENTORY,
+                                     RunManifest)
+from csam_inventory.waits import Waiter
 
 LOGIN_URL = "login.aspx"
 LOGIN_USER_FIELD_NAME = "Login1$UserName"
@@ -64,6 +70,18 @@ SYSTEM_APPENDIX_LINK_ID = (
 
 ID_ORG_ACRONYM_FILE_NAME = "id-org-acronym.csv"
 
+# seconds to wait for a page element if scraping.load_timeout is not set
+DEFAULT_LOAD_TIMEOUT = 240
+
+# seconds to wait for a download if scraping.download_timeout is not set
+DEFAULT_DOWNLOAD_TIMEOUT = 60
+
+# sub-directory of the download path into which the browser saves downloads
+STAGING_DIRECTORY_NAME = "staging"
+
+# sub-directory of the download path used by each concurrent browser session
+WORKER_DIRECTORY_FORMAT = "worker-{}"
+
 
 class Selector(Enum):
     """Various selectors for use to find objects on a page"""
@@ -76,17 +94,35 @@ class Selector(Enum):
 class CsamScraper(LoggingBase):
     """CSAM scraping functionality"""
 
-    def __init__(self, config: Dict) -> None:
+    def __init__(self, config: Dict,
+                 download_path: Optional[Path] = None) -> None:
         """Initialize an instance of the CsamScraper class
 
         Parameters
         ----------
         config: Dict
             dictionary containing configuration data
+
+        download_path: Path
+            staging directory into which the browser saves downloads; finished
+            inventories are always moved to the configured download path;
+            default: a staging sub-directory of the configured download path
         """
         self._config = config
+        self._output_path = Path(config['scraping']['download_path'])
+        self._download_path = Path(
+            download_path or self._output_path / STAGING_DIRECTORY_NAME
+        )
+        self._download_path.mkdir(parents=True, exist_ok=True)
+        self._download_timeout = config['scraping'].get(
+            'download_timeout', DEFAULT_DOWNLOAD_TIMEOUT
+        )
         self._browser = self._create_browser()
         self._logged_in = False
+        self._downloader = None  # type: Optional[AppendixDownloader]
+        self._waiter = Waiter(
+            config['scraping'].get('load_timeout', DEFAULT_LOAD_TIMEOUT)
+        )
         super().__init__()
 
     def _create_browser(self) -> Browser:
@@ -98,7 +134,7 @@ class CsamScraper(LoggingBase):
         Browser
             an instance of the Selenium/Splinter Browser instance
         """
-        download_path = Path(self._config['scraping']['download_path']).resolve()
+        download_path = Path(self._download_path).resolve()
 
         prefs = {
             "download.default_directory": str(download_path),
@@ -143,70 +179,23 @@ class CsamScraper(LoggingBase):
             Selector.NAME: self._browser.find_by_name,
         }
 
-        """ Changed this on 2/8/2022 
-        timeout = self._config['scraping']['load_timeout']
-        timeout_time = time.time() + timeout"""
-        timeout_time = time.time() + 240
-        element_found = False
-        results = None
-
-        while not element_found:
+        def element_found() -> Optional[WebDriverElement]:
             results = locators[selector](value)
-            element_found = len(results) > 0
 
-            if matching_text and element_found:
+            if len(results) == 0:
+                return None
+
+            if matching_text:
                 try:
-                    element_found = (matching_text in results.first.text)
+                    if matching_text not in results.first.text:
+                        return None
                 except StaleElementReferenceException:
                     # wait till page fully refreshes to get element
-                    continue
+                    return None
 
-            if time.time() > timeout_time:
-                raise TimeoutError("Could not find element with"
-                                   f" {selector}={value}.")
+            return results.first
 
-        return results.first
-
-    def _wait_for_download(self, files_before_download: Set[str]) -> Path:
-        """Wait for file download to complete
-
-        Parameters
-        ----------
-        files_before_download: Set[str]
-            set of strings representing the files in the download path before
-            the new file is downloaded; a change in this file set indicates
-            that a new file has been downloaded
-
-        Returns
-        -------
-        Path
-            a Path object representing the location of the newly downloaded
-            file
-        """
-        download_path = Path(self._config['scraping']['download_path'])
-        pre_download_set = set(files_before_download)
-        current_file_set = set(os.listdir(download_path))
-        """timeout = self._config['scraping']['download_timeout']
-        timeout_time = time.time() + timeout"""
-        timeout_time = time.time() + 60
-        new_file = ""
-
-        # wait for a new file that doesn't end in crdownload or tmp to appear
-        # in the download directory
-        while (pre_download_set == current_file_set
-               or new_file.endswith("crdownload")
-               or new_file.endswith("tmp")):
-            if time.time() > timeout_time:
-                raise TimeoutError("Download failed or did not complete.")
-
-            time.sleep(0.1)
-            current_file_set = set(os.listdir(download_path))
-            difference = current_file_set - pre_download_set
-
-            if len(difference) > 0:
-                new_file = (current_file_set - pre_download_set).pop()
-
-        return download_path / new_file
+        return self._waiter.until(element_found, f"{selector.name}={value}")
 
     def login(self) -> None:
         """Log into CSAM using credentials provided in the configuration file"""
@@ -231,6 +220,25 @@ class CsamScraper(LoggingBase):
         self._logged_in = True
         logging.info("Login successful.")
 
+        if self._config['scraping'].get('direct_download', False):
+            self._create_downloader()
+
+    def _create_downloader(self) -> None:
+        """Create an HTTP downloader that shares the browser's authenticated
+        session, replacing any previous downloader"""
+        if self._downloader is not None:
+            self._downloader.close()
+
+        driver = self._browser.driver
+
+        self._downloader = AppendixDownloader(
+            self._config,
+            driver.get_cookies(),
+            SYSTEM_APPENDICES_SELECTOR,
+            SYSTEM_APPENDIX_LINK_ID,
+            user_agent=driver.execute_script("return navigator.userAgent;")
+        )
+
     def retrieve_system_list(self) -> List[int]:
         """Collect a list of systems in CSAM and save that data to a CSV that
         will be used during export to match systems with orgs and acronyms
@@ -292,13 +300,20 @@ class CsamScraper(LoggingBase):
 
         return ids
 
-    def collect_hardware_inventories(self, system_list: List[int]) -> None:
+    def collect_hardware_inventories(
+            self, system_list: List[int],
+            manifest: Optional[RunManifest] = None) -> None:
         """Download hardware inventories for multiple systems
 
         Parameters
         ----------
         system_list: List[int]
             list of system IDs
+
+        manifest: RunManifest
+            if specified, the outcome of each download is recorded in the
+            manifest and a failed download is logged and skipped rather than
+            ending the run
         """
         total = len(system_list)
 
@@ -308,15 +323,36 @@ class CsamScraper(LoggingBase):
                 system, i+1, total
             )
 
-            self._collect_hardware_inventory(system)
+            if manifest is None:
+                self._collect_hardware_inventory(system)
+                continue
+
+            try:
+                hw_file = self._collect_hardware_inventory(system)
+            except (OSError, WebDriverException) as exp:
+                logging.error("Download failed for system %d: %s", system,
+                              exp)
+                manifest.record(system, FAILED, error=str(exp))
+                continue
 
-    def _collect_hardware_inventory(self, system_id: int) -> None:
+            if hw_file is None:
+                manifest.record(system, NO_INVENTORY)
+            else:
+                manifest.record(system, DOWNLOADED, hw_file)
+
+    def _collect_hardware_inventory(self, system_id: int) -> Optional[Path]:
         """Download the hardware inventory for a single system
 
         Parameters
         ----------
         system_id: int
             ID of the system whose hardware inventory should be downloaded
+
+        Returns
+        -------
+        Path
+            location of the downloaded inventory, or None if the system has
+            no hardware inventory
         """
         logging.info("Retrieving CSAM hardware inventory for system %d.",
                       system_id)
@@ -324,6 +360,24 @@ class CsamScraper(LoggingBase):
         if not self._logged_in:
             self.login()
 
+        if self._downloader is not None:
+            try:
+                hw_file = self._downloader.download(system_id,
+                                                    self._output_path)
+
+                if hw_file is None:
+                    logging.warning("No inventory found for system %d.",
+                                    system_id)
+                else:
+                    logging.debug("Hardware inventory for system %d "
+                                  "downloaded directly.", system_id)
+
+                return hw_file
+
+            except (DirectDownloadError, requests.RequestException) as exp:
+                logging.warning("Direct download failed for system %d (%s); "
+                                "falling back to the browser.", system_id, exp)
+
         logging.info("Step 1 done")
         url = urljoin(str(self._config['csam']['base_url']), SYSTEM_SEARCH_URL)
         self._browser.visit(url)
@@ -352,9 +406,6 @@ class CsamScraper(LoggingBase):
 
         appendix_list_link.click()
 
-        download_path = Path(self._config['scraping']['download_path'])
-        pre_download_file_set = set(os.listdir(download_path))
-
         try:
             hw_link = self._wait_for_element(Selector.ID,
                                              SYSTEM_APPENDIX_LINK_ID)
@@ -362,20 +413,86 @@ class CsamScraper(LoggingBase):
             # if HW inventory link is not found, the system likely doesn't have
             # an inventory file in CSAM
             logging.warning("No inventory found for system %d.", system_id)
-            return
+            return None
 
-        hw_link.click()
-
-        hw_file = self._wait_for_download(pre_download_file_set)
-
-        # wait to rename file to avoid chrome download failure messages
-        time.sleep(0.5)
+        with DownloadWatcher(self._download_path,
+                             self._download_timeout) as watcher:
+            hw_link.click()
+            hw_file = watcher.wait()
 
         extension = hw_file.suffix
-        hw_file.rename(download_path / f"hw-inventory-{system_id}{extension}")
+        hw_file = move_download(hw_file, self._output_path
+                                / f"hw-inventory-{system_id}{extension}")
 
         logging.debug("Hardware inventory for system %d downloaded.", system_id)
+        return hw_file
 
     def cleanup(self):
-        """Close the Browser instance"""
+        """Close the Browser instance and any HTTP session, and log how long
+        was spent waiting for each page element"""
+        self._waiter.log_statistics()
+
+        if self._downloader is not None:
+            self._downloader.close()
+
         self._browser.quit()
+
+        try:
+            self._download_path.rmdir()
+        except OSError:
+            # keep staging directories holding partial downloads for
+            # inspection
+            pass
+
+
+def collect_hardware_inventories_concurrently(
+        config: Dict, system_list: List[int], concurrency: int,
+        manifest: Optional[RunManifest] = None) -> None:
+    """Download hardware inventories using several browser sessions at once
+
+    System IDs are sharded across the sessions; each session logs in
+    separately and has its own download sub-directory so that downloads from
+    different sessions cannot be confused with one another.
+
+    Parameters
+    ----------
+    config: Dict
+        dictionary containing configuration data
+
+    system_list: List[int]
+        list of system IDs
+
+    concurrency: int
+        number of browser sessions to run in parallel
+
+    manifest: RunManifest
+        if specified, the outcome of each download is recorded in the manifest
+    """
+    download_path = Path(config['scraping']['download_path'])
+    shards = [system_list[i::concurrency] for i in range(concurrency)]
+    shards = [x for x in shards if x]
+
+    def collect_shard(index: int, shard: List[int]) -> None:
+        worker_path = download_path / WORKER_DIRECTORY_FORMAT.format(index)
+        scraper = CsamScraper(config, worker_path)
+
+        try:
+            scraper.login()
+            scraper.collect_hardware_inventories(shard, manifest)
+
+        finally:
+            scraper.cleanup()
+
+    logging.info("Downloading hardware inventories with %d browser sessions.",
+                 len(shards))
+
+    with ThreadPoolExecutor(max_workers=len(shards) or 1) as executor:
+        futures = [executor.submit(collect_shard, i, x)
+                   for i, x in enumerate(shards)]
+
+        # wait for every session and re-raise the first failure, if any
+        errors = [x.exception() for x in futures]
+
+    for error in errors:
+        if error is not None:
+            raise error
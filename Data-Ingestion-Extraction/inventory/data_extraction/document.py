@@ -0,0 +1,223 @@
+"""Extract data from Word and PDF files without Word
+
+This backend reads .docx files with python-docx and .pdf files with
+pdfplumber, so it runs on any platform and in parallel worker processes. It
+applies the same header search and continuation table rules as the Word (COM)
+backend in word.py. Legacy .doc files can only be read through Word.
+
+Tables are read straight from the document XML rather than through
+python-docx's object model, which creates a proxy object for every cell and
+paragraph.
+"""
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+import docx
+import pdfplumber
+
+from docx.oxml.ns import nsmap, qn
+from lxml import etree
+
+from ..log import LoggingBase
+from .tables import Table, extract_hosts_from_tables, extract_hosts_from_text
+
+# run content with a text equivalent, as in python-docx's Run.text; w:t holds
+# its own text and w:br only counts when it is a line break
+_RUN_CONTENT = {
+    'w:t': None,
+    'w:tab': '\t',
+    'w:ptab': '\t',
+    'w:br': '\n',
+    'w:cr': '\n',
+    'w:noBreakHyphen': '-',
+}
+_RUN_TEXT = {qn(x): y for x, y in _RUN_CONTENT.items()}
+_T = qn('w:t')
+_BR = qn('w:br')
+_BR_TYPE = qn('w:type')
+
+_ROWS = etree.XPath('./w:tr', namespaces=nsmap)
+_CELLS = etree.XPath('./w:tc', namespaces=nsmap)
+_V_MERGE = etree.XPath('./w:tcPr/w:vMerge', namespaces=nsmap)
+_GRID_COLUMNS = etree.XPath('./w:tblGrid/w:gridCol', namespaces=nsmap)
+_PARAGRAPHS = etree.XPath('./w:p', namespaces=nsmap)
+_TEXT = etree.XPath(
+    ' | '.join(f'./w:r/{x} | ./w:hyperlink/w:r/{x}' for x in _RUN_CONTENT),
+    namespaces=nsmap
+)
+
+
+def _paragraph_text(paragraph: etree._Element) -> str:
+    """Read the text of a w:p element
+
+    Parameters
+    ----------
+    paragraph: etree._Element
+        w:p element
+
+    Returns
+    -------
+    str
+        the text of the paragraph, with tabs and line breaks as characters
+    """
+    text = []
+
+    for element in _TEXT(paragraph):
+        if element.tag == _T:
+            text.append(element.text or '')
+        elif element.tag != _BR or \
+                element.get(_BR_TYPE, 'textWrapping') == 'textWrapping':
+            text.append(_RUN_TEXT[element.tag])
+
+    return ''.join(text)
+
+
+def _read_table(table: etree._Element) -> Table:
+    """Build a Table from a w:tbl element in a single pass over its cells
+
+    Cells are listed in the order Word numbers them within each row, so a cell
+    spanning several grid columns (w:gridSpan) occupies a single position,
+    and the continuation of a vertically merged cell (w:vMerge) is None, since
+    Word cannot access those cells individually either.
+
+    Parameters
+    ----------
+    table: etree._Element
+        w:tbl element
+
+    Returns
+    -------
+    Table
+        the text of the cells of the table
+    """
+    rows = []
+
+    for row in _ROWS(table):
+        cells = []
+
+        for cell in _CELLS(row):
+            v_merge = _V_MERGE(cell)
+
+            # w:vMerge without a value continues the cell above
+            if v_merge and v_merge[0].get(qn('w:val')) != 'restart':
+                cells.append(None)
+            else:
+                cells.append('\n'.join(_paragraph_text(x)
+                                       for x in _PARAGRAPHS(cell)))
+
+        rows.append(cells)
+
+    return Table(rows, len(_GRID_COLUMNS(table)))
+
+
+class DocumentProcessor(LoggingBase):
+    """Extract data from Word and PDF documents using python-docx and
+    pdfplumber"""
+
+    def extract_hosts(self, doc_path: str) -> List[str]:
+        """Extract hostnames from a Word or PDF document
+
+        Parameters
+        ----------
+        doc_path: str
+            path to Word or PDF document
+
+        Returns
+        -------
+        List[str]
+            a list of hostnames as strings
+        """
+        extension = Path(doc_path).suffix.lower()
+
+        if extension == '.docx':
+            tables, paragraphs = self._read_docx(doc_path)
+        elif extension == '.pdf':
+            tables, paragraphs = self._read_pdf(doc_path)
+        else:
+            self.logger.warning("Cannot read %s without Word; set "
+                                "processing.word_backend to com.", doc_path)
+            return []
+
+        self.logger.info("Extracting hosts from tables in %s.", doc_path)
+        hostnames = extract_hosts_from_tables(tables)
+        self.logger.info("Found %d hostnames in tables in %s.",
+                         len(hostnames), doc_path)
+
+        if not hostnames:
+            self.logger.info("Extracting hosts from text in %s.", doc_path)
+            hostnames = extract_hosts_from_text(paragraphs)
+            self.logger.info("Found %d hostnames in text in %s.",
+                             len(hostnames), doc_path)
+
+        return hostnames
+
+    @staticmethod
+    def _read_docx(doc_path: str) -> Tuple[List[Table], Iterable[str]]:
+        """Read the tables and paragraphs of a Word document
+
+        Parameters
+        ----------
+        doc_path: str
+            path to a .docx document
+
+        Returns
+        -------
+        List[Table], Iterable[str]
+            the top level tables of the document, and the text of every
+            paragraph in the body, including those inside tables; the text
+            is only read if it is iterated over
+        """
+        body = docx.Document(doc_path).element.body
+        tables = [_read_table(x) for x in body.iterchildren(qn('w:tbl'))]
+
+        def paragraphs() -> Iterator[str]:
+            for paragraph in body.iter(qn('w:p')):
+                yield _paragraph_text(paragraph)
+
+        return tables, paragraphs()
+
+    @staticmethod
+    def _read_pdf(doc_path: str) -> Tuple[List[Table], Iterable[str]]:
+        """Read the tables and lines of text of a PDF document
+
+        A table split across pages is read as one table per page, which the
+        continuation table rules then join back together.
+
+        Parameters
+        ----------
+        doc_path: str
+            path to a .pdf document
+
+        Returns
+        -------
+        List[Table], List[str]
+            the tables found on each page, with None for the cells covered by
+            a merged cell, and the lines of text of every page
+        """
+        tables = []
+        lines = []
+
+        with pdfplumber.open(doc_path) as pdf:
+            for page in pdf.pages:
+                tables.extend(Table(x) for x in page.extract_tables())
+                lines.extend((page.extract_text() or "").splitlines())
+
+        return tables, lines
+
+
+def extract_hostnames(file_path: str) -> List[str]:
+    """Helper function used to extract hostnames from a Word or PDF document
+    without Word
+
+    Parameters
+    ----------
+    file_path: str
+        path to a .docx or .pdf document
+
+    Returns
+    -------
+    List[str]
+        a list of hostnames, possibly empty
+    """
+    processor = DocumentProcessor()
+    return processor.extract_hosts(file_path)
@@ -1,13 +1,17 @@
 """Extract data from excel files"""
 from collections.abc import Sequence
 from pathlib import Path
-from typing import Dict, Generator, List, Union
-from zipfile import BadZipfile
+from typing import BinaryIO, Dict, Generator, Iterator, List, Tuple, Union
 
-from openpyxl import load_workbook
 import pandas as pd
 
-from csam_inventory.data_extraction.utils import clean_hostname
+from csam_inventory.data_extraction.matching import PatternMatcher
+from csam_inventory.data_extraction.readers import (CALAMINE_ENGINE,
+                                                    DEFAULT_ENGINE,
+                                                    UnreadableWorkbookError,
+                                                    WorkbookReader,
+                                                    open_workbook)
+from csam_inventory.data_extraction.utils import clean_hostnames, source_name
 from csam_inventory.log import LoggingBase
 
 
@@ -53,6 +57,17 @@ EXCLUDE_SHEETS = [
     'decommissioned'
 ]
 
+# workbook loading modes: "full" loads every cell and builds a DataFrame per
+# sheet, "streaming" reads rows in read-only mode and keeps only the hostname
+# column, and "projected" reads a sheet at a time with the selected engine and
+# passes the hostname column straight to clean_hostnames, skipping DataFrame
+# construction; projected is the default and streaming uses the least memory
+FULL_MODE = 'full'
+STREAMING_MODE = 'streaming'
+PROJECTED_MODE = 'projected'
+MODES = [FULL_MODE, STREAMING_MODE, PROJECTED_MODE]
+DEFAULT_MODE = PROJECTED_MODE
+
 # ignore rows where the first or second cells contain the following
 EXCLUDE_ROW_START = [
     "assets are owned and maintained by",
@@ -79,17 +94,46 @@ EXCLUDE_ROW_START = [
     'server order form'
 ]
 
+# checks the start of a cell against every EXCLUDE_ROW_START entry at once
+EXCLUDE_ROW_MATCHER = PatternMatcher(EXCLUDE_ROW_START)
+
 
 class ExcelProcessor(LoggingBase):
     """Extract hostnames from Excel files"""
 
-    def _load_workbook(self, file_path: str) -> Dict[str, pd.DataFrame]:
+    def __init__(self, mode: str = DEFAULT_MODE,
+                 engine: str = DEFAULT_ENGINE) -> None:
+        """Initialize an instance of the ExcelProcessor class
+
+        Parameters
+        ----------
+        mode: str
+            workbook loading mode, one of MODES; the streaming and projected
+            modes keep only the hostname column of each sheet, and streaming
+            mode always reads rows with openpyxl's read-only mode, whatever
+            the engine, which uses the least memory on large workbooks;
+            default: 'projected'
+
+        engine: str
+            workbook reader engine, one of readers.ENGINES; default:
+            'calamine', falling back to openpyxl if it is not installed
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown Excel loading mode: {mode}.")
+
+        self._mode = mode
+        self._engine = engine
+        super().__init__()
+
+    def _load_workbook(
+            self, file_path: Union[str, BinaryIO]) -> Dict[str, pd.DataFrame]:
         """Load an Excel workbook for processing
 
         Parameters
         ----------
-        file_path: str
-            path to Excel file to load
+        file_path: Union[str, BinaryIO]
+            path to Excel file to load, or a binary file object holding it
+            with the file name as its name attribute
 
         Returns
         -------
@@ -98,51 +142,53 @@ class ExcelProcessor(LoggingBase):
             the corresponding values are pandas DataFrames that contain the
             sheet data
         """
-        self.logger.info("Loading workbook at %s.", file_path)
+        if self._mode != FULL_MODE:
+            return self._load_workbook_streaming(file_path)
+
+        self.logger.info("Loading workbook at %s.", source_name(file_path))
         workbook_data = {}  # type: Dict[str, pd.DataFrame]
 
         try:
-            # need to load with data_only=True otherwise cells with formulas
-            # will return formulas rather than computed values
-            workbook = load_workbook(file_path, data_only=True)
+            workbook = open_workbook(file_path, self._engine)
 
-        except BadZipfile:
-            # xlsx a docx file are compressed zip files, if they are password
-            # protected, a BadZipfile exception is raised
+        except UnreadableWorkbookError:
             self.logger.warning(
                 "Unable to open workbook, possibly password protected."
             )
 
             return workbook_data
 
-        for sheet_name in workbook.sheetnames:
+        with workbook:
+            workbook_data = self._read_sheets(workbook)
+
+        return workbook_data
+
+    def _read_sheets(self,
+                     workbook: WorkbookReader) -> Dict[str, pd.DataFrame]:
+        """Read the data rows of each sheet of an open workbook
+
+        Parameters
+        ----------
+        workbook: WorkbookReader
+            the open workbook
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            a dictionary where each key represents a sheet from the workbook and
+            the corresponding values are pandas DataFrames that contain the
+            sheet data
+        """
+        workbook_data = {}  # type: Dict[str, pd.DataFrame]
+
+        for sheet_name in workbook.sheet_names:
             if sheet_name.lower() in EXCLUDE_SHEETS:
                 continue
 
-            sheet = workbook[sheet_name]
-            data = sheet.values
+            data = workbook.iter_rows(sheet_name)
 
             # find header row
-            headers_found = False
-            columns = []
-            while not headers_found:
-                try:
-                    row = next(data)
-
-                # if iteration through rows stops, we've reached the end of the
-                # sheet and should continue to the next one
-                except StopIteration:
-                    break
-
-                if not ExcelProcessor._is_good_row(row, is_header=True):
-                    continue
-
-                columns = row
-                headers_found = True
-
-                # print(f"---{sheet_name}---")
-                # print(columns)
-                # print(f"---{sheet_name}---")
+            columns = ExcelProcessor._find_header_row(data)
 
             if not columns:
                 self.logger.warning("Could not find header row in sheet %s.",
@@ -179,6 +225,146 @@ class ExcelProcessor(LoggingBase):
 
         return workbook_data
 
+    def _load_workbook_streaming(
+            self, file_path: Union[str, BinaryIO]) -> Dict[str, pd.DataFrame]:
+        """Load only the hostname column of each sheet in an Excel workbook
+
+        Parameters
+        ----------
+        file_path: Union[str, BinaryIO]
+            path to Excel file to load, or a binary file object holding it
+            with the file name as its name attribute
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            a dictionary where each key represents a sheet from the workbook and
+            the corresponding values are single column pandas DataFrames that
+            contain the sheet's hostname data
+        """
+        return {
+            sheet_name: pd.DataFrame({hostname_column: hosts})
+            for sheet_name, hostname_column, hosts
+            in self._iter_hostname_columns(file_path)
+        }
+
+    def _iter_hostname_columns(
+            self, file_path: Union[str, BinaryIO]
+    ) -> Iterator[Tuple[str, str, List]]:
+        """Stream the hostname column of each sheet in an Excel workbook
+
+        In streaming mode, and with the openpyxl engine, rows are read in
+        read-only mode, so cell objects for the whole workbook are never held
+        in memory; calamine loads one sheet at a time instead, which is much
+        faster. The hostname column is resolved from the header row, each
+        following row is checked as it is read and only the value in the
+        hostname column is kept.
+
+        Parameters
+        ----------
+        file_path: Union[str, BinaryIO]
+            path to Excel file to load, or a binary file object holding it
+            with the file name as its name attribute
+
+        Returns
+        -------
+        Iterator[Tuple[str, str, List]]
+            for each sheet with hostname data, the sheet name, the name of the
+            hostname column and the values from that column
+        """
+        file_name = source_name(file_path)
+        self.logger.info("Streaming workbook at %s.", file_name)
+
+        read_only = self._mode == STREAMING_MODE or \
+            self._engine != CALAMINE_ENGINE
+
+        try:
+            workbook = open_workbook(file_path, self._engine,
+                                     read_only=read_only)
+
+        except UnreadableWorkbookError:
+            self.logger.warning(
+                "Unable to open workbook, possibly password protected."
+            )
+
+            return
+
+        try:
+            for sheet_name in workbook.sheet_names:
+                if sheet_name.lower() in EXCLUDE_SHEETS:
+                    continue
+
+                data = workbook.iter_rows(sheet_name)
+                columns = ExcelProcessor._find_header_row(data)
+
+                if not columns:
+                    self.logger.warning(
+                        "Could not find header row in sheet %s.", sheet_name
+                    )
+
+                    continue
+
+                hostname_column = self._resolve_hostname_column(file_name,
+                                                                 columns)
+
+                if not hostname_column:
+                    self.logger.warning(
+                        "Could not find hostname column in %s. "
+                        "Manual modification may be required.", sheet_name
+                    )
+
+                    continue
+
+                column_index = columns.index(hostname_column)
+                width = len(columns)
+                hosts = []
+
+                for row in data:
+                    # read-only sheets without stored dimensions yield rows of
+                    # varying length; size them to the header row as a fully
+                    # loaded sheet would
+                    if len(row) != width:
+                        row = (row + (None,) * width)[:width]
+
+                    has_entries = any(str(x).strip() for x in row if x)
+
+                    if has_entries and ExcelProcessor._is_good_row(
+                            row, width, is_header=False):
+                        hosts.append(row[column_index])
+
+                if not hosts:
+                    self.logger.warning("Could not find data in sheet %s.",
+                                        sheet_name)
+
+                    continue
+
+                yield sheet_name, hostname_column, hosts
+
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _find_header_row(data: Iterator[tuple]) -> Tuple:
+        """Advance through rows of sheet data until a header row is found
+
+        Parameters
+        ----------
+        data: Iterator[tuple]
+            iterator over the rows of a sheet; on return it is positioned at
+            the row after the header row
+
+        Returns
+        -------
+        tuple
+            the header row, or an empty tuple if the end of the sheet was
+            reached without finding one
+        """
+        for row in data:
+            if ExcelProcessor._is_good_row(row, is_header=True):
+                return row
+
+        return ()
+
     @staticmethod
     def _is_good_row(row: Sequence, length: int = 2,
                      is_header: bool = True) -> bool:
@@ -209,10 +395,8 @@ class ExcelProcessor(LoggingBase):
         entry_0 = str(row[0]).lower().strip() if row_len > 0 and row[0] else ""
         entry_1 = str(row[1]).lower().strip() if row_len > 1 and row[1] else ""
 
-        has_bad_entries = (
-                any(entry_0.startswith(x) for x in EXCLUDE_ROW_START)
-                or any(entry_1.startswith(x) for x in EXCLUDE_ROW_START)
-        )
+        has_bad_entries = (EXCLUDE_ROW_MATCHER.match(entry_0)
+                           or EXCLUDE_ROW_MATCHER.match(entry_1))
 
         if is_header:
             has_correct_length = (len(set(str(x).lower().strip()
@@ -225,14 +409,14 @@ class ExcelProcessor(LoggingBase):
 
         return False
 
-    def _extract_hosts(self, file_path: str,
+    def _extract_hosts(self, file_path: Union[str, BinaryIO],
                        workbook_data: Dict[str, pd.DataFrame]) -> List[str]:
         """Extract hostnames from workbook data
 
         Parameters
         ----------
-        file_path: str
-            path to the Excel file
+        file_path: Union[str, BinaryIO]
+            path to the Excel file, or a binary file object holding it
 
         workbook_data: Dict[str, pd.DataFrame]
             a dictionary where each key represents a sheet from the workbook and
@@ -245,20 +429,15 @@ class ExcelProcessor(LoggingBase):
             a list of hostnames, possibly empty
         """
         hostnames = []
-        file_path = str(file_path)  # in case it's passed in as a Path object
-        file_stem = Path(file_path).stem
+        file_name = source_name(file_path)
 
         for sheet_name, system_data in workbook_data.items():
             self.logger.info("Processing sheet %s.", sheet_name)
 
-            if file_stem in UNIQUE_HEADERS.keys():
-                hostname_column = UNIQUE_HEADERS[file_stem]
-
-            else:
-                hostname_column = self._find_hostname_column(
-                    file_path,
-                    system_data
-                )
+            hostname_column = self._resolve_hostname_column(
+                file_name,
+                system_data.columns
+            )
 
             if not hostname_column:
                 self.logger.warning("Could not find hostname column in %s. "
@@ -273,21 +452,76 @@ class ExcelProcessor(LoggingBase):
             # print(hosts)
             # print(f"---{sheet_name}---")
 
-            for value in hosts:
-                hostnames.extend(clean_hostname(value))
+            hostnames.extend(clean_hostnames(hosts))
 
         hostnames = list(set(hostnames))
-        self.logger.info('Found %d hosts in %s.', len(hostnames), file_path)
+        self.logger.info('Found %d hosts in %s.', len(hostnames), file_name)
         return hostnames
 
+    def _extract_hosts_projected(self,
+                                 file_path: Union[str, BinaryIO]) -> List[str]:
+        """Extract hostnames by streaming each sheet's hostname column
+        directly into clean_hostnames, without building DataFrames
+
+        Parameters
+        ----------
+        file_path: Union[str, BinaryIO]
+            path to the Excel file, or a binary file object holding it
+
+        Returns
+        -------
+        List[str]
+            a list of hostnames, possibly empty
+        """
+        hostnames = set()
+
+        for sheet_name, _, hosts in self._iter_hostname_columns(file_path):
+            self.logger.info("Processing sheet %s.", sheet_name)
+
+            hostnames.update(clean_hostnames(x for x in hosts if x))
+
+        hostnames = list(hostnames)
+        self.logger.info('Found %d hosts in %s.', len(hostnames),
+                         source_name(file_path))
+        return hostnames
+
+    def _resolve_hostname_column(self, file_path: str,
+                                 columns: Sequence) -> Union[str, None]:
+        """Determine which column of a sheet contains hostnames, using the
+        UNIQUE_HEADERS entry for the file if there is one
+
+        Parameters
+        ----------
+        file_path: str
+            path to the Excel file
+
+        columns: Sequence
+            header names of the sheet
+
+        Returns
+        -------
+        str
+            the name of the hostname column or None
+        """
+        file_stem = Path(file_path).stem
+
+        if file_stem in UNIQUE_HEADERS.keys():
+            hostname_column = UNIQUE_HEADERS[file_stem]
+            return hostname_column if hostname_column in columns else None
+
+        return self._find_hostname_column(file_path, columns)
+
     def _find_hostname_column(self, file_path: str,
-                              data_frame: pd.DataFrame) -> Union[str, None]:
-        """Locate the column in a DataFrame with a header in the HEADERS list
+                              columns: Sequence) -> Union[str, None]:
+        """Locate the column with a header in the HEADERS list
 
         Parameters
         ----------
-        data_frame: pandas DataFrame
-            DataFrame representing a sheet from a workbook
+        file_path: str
+            path to the Excel file
+
+        columns: Sequence
+            header names of a sheet from a workbook
 
         Returns
         -------
@@ -297,7 +531,7 @@ class ExcelProcessor(LoggingBase):
         file_stem = Path(file_path).stem
         excluded_headers = EXCLUDE_HEADERS_BY_FILE.get(file_stem, [])
 
-        for name in data_frame.columns:
+        for name in columns:
             if not name or name.lower().strip() in excluded_headers:
                 continue
 
@@ -310,25 +544,32 @@ class ExcelProcessor(LoggingBase):
 
         return None
 
-    def process_inventory(self, workbook_path: str) -> List[str]:
+    def process_inventory(self,
+                          workbook_path: Union[str, BinaryIO]) -> List[str]:
         """Process an Excel file to extract hostname data
 
         Parameters
         ----------
-        workbook_path: str
-            path to Excel file
+        workbook_path: Union[str, BinaryIO]
+            path to Excel file, or a binary file object holding it with the
+            file name as its name attribute
 
         Returns
         -------
         List[str]
             a list of hostnames, possibly empty
         """
+        if self._mode == PROJECTED_MODE:
+            return self._extract_hosts_projected(workbook_path)
+
         inventory_data = self._load_workbook(workbook_path)
         hostnames = self._extract_hosts(workbook_path, inventory_data)
         return hostnames
 
 
-def extract_hostnames(file_path: str) -> List[str]:
+def extract_hostnames(file_path: Union[str, BinaryIO],
+                      mode: str = DEFAULT_MODE,
+                      engine: str = DEFAULT_ENGINE) -> List[str]:
     """Extract hostnames from an Excel file
 
     This is a helper method that handles creation of an instance of the
@@ -336,13 +577,20 @@ def extract_hostnames(file_path: str) -> List[str]:
 
     Parameters
     ----------
-    file_path: str
-        path to an Excel file
+    file_path: Union[str, BinaryIO]
+        path to an Excel file, or a binary file object holding one with the
+        file name as its name attribute (such as a ZIP archive member)
+
+    mode: str
+        workbook loading mode, one of MODES; see ExcelProcessor
+
+    engine: str
+        workbook reader engine, one of readers.ENGINES; see ExcelProcessor
 
     Returns
     -------
     List[str]
         a list of hostnames, possibly empty
     """
-    processor = ExcelProcessor()
+    processor = ExcelProcessor(mode, engine)
     return processor.process_inventory(file_path)
@@ -0,0 +1,186 @@
+"""Find any of a list of strings in text with one compiled pattern
+
+Several steps check text against a list of strings: rows are removed when a
+cell contains a marker, rows are skipped when their first cells start with
+guidance text, and template versions are recognized by column names in the
+header. Testing each string in turn makes every check slower as the lists
+grow. A PatternMatcher compiles its strings into a single regular expression
+shaped like a trie, so strings sharing a prefix share the work of matching
+it, and the text is scanned once however many strings there are.
+"""
+
+import re
+
+from typing import (Dict, FrozenSet, Iterable, Optional, Pattern, Sequence,
+                    Set)
+
+# joins the cells of a row so that a row is searched once; patterns cannot
+# contain it, so a match never spans two cells
+CELL_SEPARATOR = '\x00'
+
+
+def _trie_regex(patterns: Iterable[str]) -> str:
+    """Build a regular expression matching any of a set of strings
+
+    The strings are arranged in a trie, so that the expression branches only
+    where they differ: ['abc', 'abd', 'x'] becomes 'ab[cd]|x'. Where one
+    string is a prefix of another, the longer string is tried first.
+
+    Parameters
+    ----------
+    patterns: Iterable[str]
+        non-empty strings to match
+
+    Returns
+    -------
+    str
+        the regular expression
+    """
+    trie = {}  # type: Dict[str, Dict]
+
+    for pattern in patterns:
+        node = trie
+
+        for char in pattern:
+            node = node.setdefault(char, {})
+
+        node[''] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+
+        if not branches:
+            return ''
+
+        if all(len(x) == 1 or (len(x) == 2 and x[0] == '\\')
+               for x in branches) and len(branches) > 1:
+            expression = f"[{''.join(branches)}]"
+        elif len(branches) > 1 or is_end:
+            expression = f"(?:{'|'.join(branches)})"
+        else:
+            expression = branches[0]
+
+        return expression + '?' if is_end else expression
+
+    return build(trie)
+
+
+class PatternMatcher:
+    """Match text against a list of strings in one pass"""
+
+    def __init__(self, patterns: Sequence[str],
+                 ignore_case: bool = False) -> None:
+        """Initialize an instance of the PatternMatcher class
+
+        Parameters
+        ----------
+        patterns: Sequence[str]
+            strings to look for; empty strings are ignored
+
+        ignore_case: bool
+            match the strings regardless of case
+        """
+        self.patterns = [x for x in patterns if x]
+        self.ignore_case = ignore_case
+
+        self._regex = None  # type: Optional[Pattern]
+        self._overlapping = None  # type: Optional[Pattern]
+        self._prefixes = {}  # type: Dict[str, FrozenSet[str]]
+
+        if not self.patterns:
+            return
+
+        flags = re.IGNORECASE if ignore_case else 0
+        expression = _trie_regex(self.patterns)
+        self._regex = re.compile(expression, flags)
+
+        # each string is found at the position it starts from, by looking
+        # ahead for the longest string there; the shorter strings starting
+        # at the same position are its prefixes
+        self._overlapping = re.compile(f"(?=({expression}))", flags)
+
+        for pattern in self.patterns:
+            key = pattern.lower() if ignore_case else pattern
+            self._prefixes[key] = frozenset(
+                x for x in self.patterns
+                if key.startswith(x.lower() if ignore_case else x)
+            )
+
+    def __repr__(self) -> str:
+        return f"PatternMatcher({self.patterns!r}, {self.ignore_case!r})"
+
+    def search(self, text: str) -> bool:
+        """Check whether text contains any of the strings
+
+        Parameters
+        ----------
+        text: str
+            text to search
+
+        Returns
+        -------
+        bool
+            true if one of the strings occurs in the text
+        """
+        return self._regex is not None and \
+            self._regex.search(text) is not None
+
+    def match(self, text: str) -> bool:
+        """Check whether text starts with any of the strings
+
+        Parameters
+        ----------
+        text: str
+            text to check
+
+        Returns
+        -------
+        bool
+            true if the text starts with one of the strings
+        """
+        return self._regex is not None and \
+            self._regex.match(text) is not None
+
+    def search_cells(self, cells: Iterable) -> bool:
+        """Check whether the text of a non-empty cell contains any of the
+        strings
+
+        Parameters
+        ----------
+        cells: Iterable
+            values of the cells of a row
+
+        Returns
+        -------
+        bool
+            true if one of the strings occurs in a cell
+        """
+        return self.search(CELL_SEPARATOR.join(str(x) for x in cells if x))
+
+    def find_all(self, text: str) -> Set[str]:
+        """Find which of the strings occur in text
+
+        Parameters
+        ----------
+        text: str
+            text to search
+
+        Returns
+        -------
+        Set[str]
+            the strings that occur, including overlapping occurrences, as
+            given to the matcher
+        """
+        found = set()  # type: Set[str]
+
+        if self._overlapping is None:
+            return found
+
+        for match in self._overlapping.finditer(text):
+            key = match.group(1)
+            found.update(self._prefixes.get(
+                key.lower() if self.ignore_case else key, ()))
+
+        return found
@@ -0,0 +1,247 @@
+"""Read the cell values of Excel workbooks with a choice of engine
+
+The calamine engine parses workbooks with the Rust calamine library through
+python-calamine and is several times faster than openpyxl, which parses the
+workbook XML in pure Python. Both engines yield rows as tuples of cell values
+in the form openpyxl uses (None for empty cells, int for whole numbers,
+datetime for dates), so the rest of the extraction code does not depend on
+the engine. openpyxl remains available as a fallback for workbooks calamine
+cannot read and for machines without python-calamine.
+
+calamine parses a whole sheet into memory however its rows are read, so
+read-only opens, which callers use to keep memory bounded on large
+workbooks, always stream rows with openpyxl's read-only mode. calamine only
+reads the values cached for formula cells, so workbooks whose formulas are
+needed are opened with openpyxl as well.
+"""
+import datetime
+import logging
+import os
+
+from typing import BinaryIO, Iterator, List, Optional, Union
+from zipfile import BadZipfile
+
+from openpyxl import load_workbook
+
+try:
+    import python_calamine
+except ImportError:  # pragma: no cover - depends on the environment
+    python_calamine = None
+
+CALAMINE_ENGINE = 'calamine'
+OPENPYXL_ENGINE = 'openpyxl'
+ENGINES = [CALAMINE_ENGINE, OPENPYXL_ENGINE]
+
+DEFAULT_ENGINE = CALAMINE_ENGINE
+
+# engines for which a missing dependency has already been reported
+_warnings_issued = set()
+
+
+class UnreadableWorkbookError(Exception):
+    """Raised when a workbook cannot be opened, usually because it is
+    password protected"""
+
+
+class WorkbookReader:
+    """Rows of cell values from each sheet of a workbook"""
+
+    engine = None  # type: Optional[str]
+
+    def __init__(self) -> None:
+        self.sheet_names = []  # type: List[str]
+
+    def __enter__(self) -> 'WorkbookReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def iter_rows(self, sheet_name: str) -> Iterator[tuple]:
+        """Iterate over the rows of a sheet, starting at the first row
+
+        Parameters
+        ----------
+        sheet_name: str
+            name of the sheet
+
+        Returns
+        -------
+        Iterator[tuple]
+            the values of the cells of each row, from the first column to
+            the last column in use; empty cells are None
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the underlying file"""
+
+
+class OpenpyxlReader(WorkbookReader):
+    """Read workbooks with openpyxl"""
+
+    engine = OPENPYXL_ENGINE
+
+    def __init__(self, source: Union[str, BinaryIO],
+                 read_only: bool = False, formulas: bool = False) -> None:
+        """Initialize an instance of the OpenpyxlReader class
+
+        Parameters
+        ----------
+        source: Union[str, BinaryIO]
+            path to the workbook, or a binary file object holding it
+
+        read_only: bool
+            whether to use openpyxl's read-only mode, which streams rows
+            instead of loading every cell into memory
+
+        formulas: bool
+            whether cells with formulas give their formulas, such as '=1+2',
+            rather than the values cached when the workbook was last saved
+        """
+        super().__init__()
+
+        try:
+            # need to load with data_only=True otherwise cells with formulas
+            # will return formulas rather than computed values
+            self._workbook = load_workbook(source, read_only=read_only,
+                                           data_only=not formulas)
+
+        except BadZipfile as exp:
+            # xlsx a docx file are compressed zip files, if they are password
+            # protected, a BadZipfile exception is raised
+            raise UnreadableWorkbookError(str(exp)) from exp
+
+        self.sheet_names = self._workbook.sheetnames
+        self._read_only = read_only
+
+    def iter_rows(self, sheet_name: str) -> Iterator[tuple]:
+        return self._workbook[sheet_name].iter_rows(values_only=True)
+
+    def close(self) -> None:
+        # read-only workbooks keep the underlying file open
+        if self._read_only:
+            self._workbook.close()
+
+
+def _convert_cell(value):
+    """Convert a calamine cell value to the value openpyxl would return
+
+    Parameters
+    ----------
+    value: object
+        cell value from python-calamine
+
+    Returns
+    -------
+    object
+        None for empty cells, int for whole numbers, datetime for dates, and
+        other values unchanged
+    """
+    value_type = type(value)
+
+    if value_type is str:
+        return value if value else None
+
+    if value_type is float:
+        return int(value) if value.is_integer() else value
+
+    if value_type is datetime.date:
+        return datetime.datetime(value.year, value.month, value.day)
+
+    return value
+
+
+class CalamineReader(WorkbookReader):
+    """Read workbooks with python-calamine"""
+
+    engine = CALAMINE_ENGINE
+
+    def __init__(self, source: Union[str, BinaryIO]) -> None:
+        """Initialize an instance of the CalamineReader class
+
+        Parameters
+        ----------
+        source: Union[str, BinaryIO]
+            path to the workbook, or a binary file object holding it
+        """
+        super().__init__()
+
+        if isinstance(source, (str, os.PathLike)):
+            self._workbook = python_calamine.CalamineWorkbook.from_path(
+                str(source)
+            )
+        else:
+            self._workbook = python_calamine.CalamineWorkbook.from_filelike(
+                source
+            )
+
+        self.sheet_names = self._workbook.sheet_names
+
+    def iter_rows(self, sheet_name: str) -> Iterator[tuple]:
+        sheet = self._workbook.get_sheet_by_name(sheet_name)
+
+        for row in sheet.to_python(skip_empty_area=False):
+            yield tuple(_convert_cell(x) for x in row)
+
+    def close(self) -> None:
+        self._workbook.close()
+
+
+def open_workbook(source: Union[str, BinaryIO],
+                  engine: str = DEFAULT_ENGINE,
+                  read_only: bool = False,
+                  formulas: bool = False) -> WorkbookReader:
+    """Open a workbook with the requested engine
+
+    Parameters
+    ----------
+    source: Union[str, BinaryIO]
+        path to the workbook, or a binary file object holding it
+
+    engine: str
+        one of ENGINES; if calamine is requested but python-calamine is not
+        installed or cannot read the workbook, openpyxl is used instead
+
+    read_only: bool
+        whether to stream rows rather than load every cell; read-only
+        workbooks are always opened with openpyxl, since calamine loads a
+        whole sheet at a time
+
+    formulas: bool
+        whether cells with formulas give their formulas rather than their
+        cached values; such workbooks are always opened with openpyxl, since
+        calamine only reads cached values
+
+    Returns
+    -------
+    WorkbookReader
+        reader for the workbook; an UnreadableWorkbookError is raised if the
+        workbook cannot be opened
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown workbook engine: {engine}.")
+
+    use_calamine = engine == CALAMINE_ENGINE and not (read_only or formulas)
+
+    if use_calamine and python_calamine is not None:
+        try:
+            return CalamineReader(source)
+
+        except python_calamine.ZipError as exp:
+            # password protected workbooks are not zip files; openpyxl would
+            # not be able to read them either
+            raise UnreadableWorkbookError(str(exp)) from exp
+
+        except python_calamine.CalamineError as exp:
+            logging.warning("calamine could not read the workbook (%s); "
+                            "falling back to openpyxl.", exp)
+
+            if hasattr(source, 'seek'):
+                source.seek(0)
+
+    elif use_calamine and not _warnings_issued:
+        logging.warning("python-calamine is not installed; using openpyxl.")
+        _warnings_issued.add(engine)
+
+    return OpenpyxlReader(source, read_only, formulas)
@@ -0,0 +1,267 @@
+"""Locate hostnames in tables read from Word and PDF documents
+
+Tables are modelled as lists of rows of cell text, with None standing in for
+cells that cannot be read individually (merged cells), as Word reports them.
+Row and column positions are 1-based, matching the Word object model used by
+the COM backend, so the logic here reads the same as WordProcessor.
+
+The hostname header of a table is located while the table is built, in the
+same pass that stores its cells, so each cell is visited once for header
+detection and only the hostname column is read again afterwards.
+"""
+
+import logging
+
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from .utils import clean_hostname
+
+# list of possible headers for column containing hostnames, 'hostname' should
+# be the last element so other can be matched first
+HEADERS = ['cname', 'hostname', 'identifier']
+
+
+def _find_header(cells: Sequence[Optional[str]], row_index: int) -> \
+        Union[Tuple[int, int, str], Tuple[None, None, None]]:
+    """Look for a header in the HEADERS list in a row of a table
+
+    Parameters
+    ----------
+    cells: Sequence[Optional[str]]
+        text of each cell of the row
+
+    row_index: int
+        1-based row position
+
+    Returns
+    -------
+    int, int, str or None, None, None
+        the row position, column position, and header name of the first
+        header in the row; if there is none, None, None, None is returned
+    """
+    for column_index, cell_text in enumerate(cells, 1):
+        # merged cells cannot be read
+        if cell_text is None:
+            continue
+
+        cell_text = cell_text.lower().replace(" ", "")
+
+        # system 602 contains both cname and hostname columns
+        # use the cname column and split entries by tab characters
+        # or spaces
+        for header in HEADERS:
+            if header in cell_text:
+                return row_index, column_index, header
+
+    return None, None, None
+
+
+class Table:
+    """Text of the cells of a table, and the position of its hostname header"""
+
+    def __init__(self, rows: Sequence[Sequence[Optional[str]]],
+                 column_count: Optional[int] = None) -> None:
+        """Initialize an instance of the Table class
+
+        Parameters
+        ----------
+        rows: Sequence[Sequence[Optional[str]]]
+            text of each cell, row by row; None marks a cell that cannot be
+            read, such as the continuation of a vertically merged cell
+
+        column_count: int
+            number of columns in the table grid; default: the length of the
+            longest row
+        """
+        self._rows = []  # type: List[List[Optional[str]]]
+        self.header = (None, None, None)  # type: tuple
+        longest_row = 0
+
+        for row_index, row in enumerate(rows, 1):
+            cells = list(row)
+            self._rows.append(cells)
+            longest_row = max(longest_row, len(cells))
+
+            if self.header[0] is None:
+                # cells outside the table grid cannot be headers
+                self.header = _find_header(cells[:column_count], row_index)
+
+        self.row_count = len(self._rows)
+        self.column_count = (column_count if column_count is not None
+                             else longest_row)
+
+    def cell(self, row: int, column: int) -> Optional[str]:
+        """Read the text of a cell
+
+        Parameters
+        ----------
+        row: int
+            1-based row position
+
+        column: int
+            1-based column position
+
+        Returns
+        -------
+        str
+            the text of the cell, or None if the cell is merged or missing,
+            the cases in which Word raises an error
+        """
+        if not 1 <= row <= self.row_count:
+            return None
+
+        cells = self._rows[row - 1]
+
+        if not 1 <= column <= len(cells):
+            return None
+
+        return cells[column - 1]
+
+    def column(self, column: int, start_row: int = 1) -> List[Optional[str]]:
+        """Read the text of the cells in a column
+
+        Parameters
+        ----------
+        column: int
+            1-based column position
+
+        start_row: int
+            1-based position of the first row to read
+
+        Returns
+        -------
+        List[Optional[str]]
+            the text of each cell, with None for merged or missing cells
+        """
+        return [cells[column - 1] if column <= len(cells) else None
+                for cells in self._rows[max(start_row, 1) - 1:]]
+
+
+def find_hostname_column(table: Table) -> \
+        Union[Tuple[int, int, str], Tuple[None, None, None]]:
+    """Locate the column in a table with a header in the HEADERS list
+
+    Parameters
+    ----------
+    table: Table
+        table extracted from a Word or PDF document
+
+    Returns
+    -------
+    int, int, str or None, None, None
+        the row position, column position, and header name for the hostname
+        header; if the header cannot be found, None, None, None is returned
+    """
+    row_index, column_index, header = table.header
+
+    if header is not None:
+        logging.debug("Found header %s at (%d, %d).", header, row_index,
+                      column_index)
+
+    return row_index, column_index, header
+
+
+def extract_hosts_from_tables(tables: Sequence[Table]) -> List[str]:
+    """Extract hostnames from the tables of a document
+
+    A table without a hostname header is treated as a continuation of the
+    previous table when the first entry in the previous table's hostname
+    column starts like the last hostname collected.
+
+    Parameters
+    ----------
+    tables: Sequence[Table]
+        tables of a Word or PDF document, in document order
+
+    Returns
+    -------
+    List[str]
+        a list of unique hostnames as strings
+    """
+    hostnames = []  # type: List[str]
+    previous_host_column = 0
+    previous_hostname_header = None
+
+    for table in tables:
+        header_row, host_column, hostname_header = find_hostname_column(table)
+
+        # no results for hostname column and no previous results
+        if not host_column and not previous_host_column:
+            continue
+
+        if hostnames and previous_host_column:
+            # if next table doesn't have enough columns, continue
+            if (table.column_count <= previous_host_column
+                    or table.row_count == 0):
+                continue
+
+            # if the first row isn't as long as the rest of the table
+            # or contains merged cells, look at the second row
+            test_text = table.cell(1, previous_host_column)
+
+            if test_text is None:
+                test_text = table.cell(2, previous_host_column) or ""
+
+            test_hostnames = clean_hostname(test_text,
+                                            previous_hostname_header)
+
+            if not test_hostnames:
+                continue
+
+            test_hostname, *_ = test_hostnames
+
+            # compare the beginning of the first element of new table
+            # with the beginning of the last hostname collected, if they
+            # are the same, treat this table as a continuation of the
+            # previous table
+            if test_hostname[:4] == hostnames[-1][:4]:
+                header_row = 0
+                host_column = previous_host_column
+                hostname_header = previous_hostname_header
+            else:
+                previous_host_column = 0
+                previous_hostname_header = None
+                continue
+
+        # the previous table had a header but no hostnames
+        if not host_column:
+            continue
+
+        # iterate through rows
+        for text in table.column(host_column, header_row + 1):
+            # merged cells across rows cannot be read
+            if text is None:
+                continue
+
+            hostnames.extend(clean_hostname(text, hostname_header))
+
+        # keep these values in case we need to read from the next table
+        previous_host_column = host_column
+        previous_hostname_header = hostname_header
+
+    return list(set(hostnames))
+
+
+def extract_hosts_from_text(paragraphs: Iterable[str]) -> List[str]:
+    """Extract hostnames from "Device Name:" lines in the text of a document;
+    this should be used if hostnames could not be extracted from tables
+
+    Parameters
+    ----------
+    paragraphs: Iterable[str]
+        text of each paragraph or line of the document
+
+    Returns
+    -------
+    List[str]
+        a list of unique hostnames as strings, possibly an empty list
+    """
+    hostnames = []
+
+    for paragraph in paragraphs:
+        text = paragraph.lower().strip()
+
+        if "device name:" in text:
+            hostnames.extend(clean_hostname(text.split()[-1]))
+
+    return list(set(hostnames))
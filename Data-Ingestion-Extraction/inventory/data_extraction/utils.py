@@ -3,7 +3,8 @@
 import re
 import string
 
-from typing import List, Union
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Union
 
 EXCLUDED_HOSTNAMES = [
     "bigiploadbalancer",
@@ -20,6 +21,54 @@ IP_ADDR_REGEX = re.compile(r'^((\d+)\.){3}(\d+)$')
 
 PRINTABLE = set(string.printable)
 
+# compiled patterns used by clean_hostnames to apply the clean_hostname rules
+# to a whole column at once; the column is joined into a single string with
+# one candidate per line, so each pattern runs once over all of the values
+PARENS_REGEX = re.compile(r"[(\[].*?[)\]]")
+
+# line boundaries used by str.splitlines, plus commas and tabs; \r\n is
+# replaced before these are applied
+SEPARATOR_REGEX = re.compile(
+    '[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029,\t]'
+)
+CNAME_SEPARATOR_REGEX = re.compile(
+    '[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029,\t ]'
+)
+
+# spaces and characters other than printable ASCII, apart from the newlines
+# separating candidates; other printable white space has already been
+# treated as a separator, so no stripping is needed after this
+REMOVE_REGEX = re.compile(
+    f"[^{re.escape(string.printable.replace(' ', ''))}]"
+)
+
+# the first part of each line that is not an IP address, provided it is a
+# valid hostname
+CANDIDATE_REGEX = re.compile(
+    r'^(?!(?:\d+\.){3}\d+$)([a-z0-9_-]+)(?:\.[^\n]*)?$',
+    re.MULTILINE
+)
+
+
+def source_name(source: Union[str, Path, BinaryIO]) -> str:
+    """Determine the file name of a path or an in-memory file
+
+    Parameters
+    ----------
+    source: Union[str, Path, BinaryIO]
+        path to a file, or a binary file object whose name attribute holds
+        the name of the file it contains
+
+    Returns
+    -------
+    str
+        the path as a string, or the name of the file object
+    """
+    if isinstance(source, (str, Path)):
+        return str(source)
+
+    return str(getattr(source, 'name', ''))
+
 
 def remove_parens(host: str) -> str:
     """Remove parentheses, brackets, and anything between them
@@ -130,3 +179,52 @@ def clean_hostname(hostname: str,
     hostnames = [x for x in hostnames if x]
 
     return list(set(hostnames))
+
+
+def clean_hostnames(values: Iterable,
+                    header_field: Union[str, None] = "hostname") -> List[str]:
+    """Clean up a whole column of candidate hostnames at once
+
+    This applies the same rules as clean_hostname but runs each rule as a
+    single regular expression pass over all of the values, rather than
+    calling clean_hostname once per cell.
+
+    Parameters
+    ----------
+    values: Iterable
+        candidate hostnames to be cleaned, such as the values in a column
+
+    header_field: str
+        name of the field in tabular data from which the hostnames were
+        extracted, when header_field == 'cname', hostnames will be split on
+        spaces
+
+    Returns
+    -------
+    List[str]
+        list of unique hostnames from all of the values, possibly an empty
+        list
+    """
+    # strip white space and url components from each value
+    text = '\n'.join(
+        str(x).strip().replace('https://', '').replace('http://', '')
+        .strip('/')
+        for x in values
+    )
+
+    # put each candidate on its own line
+    text = text.replace('\r\n', '\n')
+
+    if header_field == "cname":
+        text = CNAME_SEPARATOR_REGEX.sub('\n', text)
+    else:
+        text = SEPARATOR_REGEX.sub('\n', text)
+
+    # remove text in parentheses/brackets, spaces and non-ascii characters
+    text = PARENS_REGEX.sub('', text)
+    text = REMOVE_REGEX.sub('', text).lower()
+
+    hostnames = set(CANDIDATE_REGEX.findall(text))
+    hostnames.difference_update(EXCLUDED_HOSTNAMES)
+
+    return list(hostnames)
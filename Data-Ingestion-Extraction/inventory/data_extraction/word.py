@@ -5,12 +5,9 @@ import pywintypes
 import win32com.client as win32
 
 from ..log import LoggingBase
+from .tables import HEADERS
 from .utils import clean_hostname
 
-# list of possible headers for column containing hostnames, 'hostname' should
-# be the last element so other can be matched first
-HEADERS = ['cname', 'hostname', 'identifier']
-
 
 class WordProcessor(LoggingBase):
     """Extract data from Word and PDF documents"""
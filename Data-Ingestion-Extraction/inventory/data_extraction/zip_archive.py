@@ -1,52 +1,87 @@
-"""Extract files from ZIP files for further processing """
+"""Read files from ZIP files for further processing"""
 
 import logging
+import shutil
+import tempfile
 
-from pathlib import Path
-from typing import List
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, Union
 from zipfile import ZipFile
 
+from .utils import source_name
 
-def extract_hostnames(zip_path: str) -> List[Path]:
-    """Extract files from a ZIP file for further processing
+
+def iter_members(zip_path: Union[str, BinaryIO]) -> Iterator[BytesIO]:
+    """Read the files in a ZIP file into memory for further processing
+
+    Members are decompressed into in-memory file objects, so nothing is
+    written to the directory holding the ZIP file.
 
     Parameters
     ----------
-    zip_path: str
-        path to a ZIP file from which other files will be extracted
+    zip_path: Union[str, BinaryIO]
+        path to a ZIP file, or a binary file object holding one with the file
+        name as its name attribute
 
     Returns
     -------
-    List[Path]
-        a list of Path objects representing the location of the newly
-        extracted files
+    Iterator[BytesIO]
+        the contents of each file in the ZIP file; the name attribute of each
+        holds a file name in the form of hw-inventory-X-ID.SUFFIX
+        where X is the files index within the zip file,
+        ID is the system ID extracted from the zip file name,
+        and SUFFIX is the original suffix of the file.
     """
-    logging.info("Extracting files from %s.", zip_path)
+    zip_name = source_name(zip_path)
+    logging.info("Reading files from %s.", zip_name)
 
-    extracted_files = []
-    file_path = Path(zip_path)
-    file_stem = file_path.stem
-    out_dir = file_path.parent
+    prefix, system_id = Path(zip_name).stem.rsplit('-', 1)
+    count = 0
 
-    with ZipFile(file_path) as zip_data:
+    with ZipFile(zip_path) as zip_data:
         for i, file in enumerate(zip_data.filelist):
-            orig_path = out_dir / file.filename
-            zip_data.extract(file, out_dir)
-            prefix, system_id = file_stem.rsplit('-', 1)
-
-            # extracted files will have names in the form of
-            # hw-inventory-X-ID.SUFFIX
-            # where X is the files index within the zip file,
-            # ID is the system ID extracted from the zip file name,
-            # and SUFFIX is the original suffix of the extracted file.
-            renamed_path = (
-                    out_dir / f"{prefix}-{i}-{system_id}{orig_path.suffix}"
-            )
-
-            orig_path.replace(renamed_path)
-            extracted_files.append(renamed_path)
-
-    logging.info("Extracted %d {len(extracted_files)} files from %s.",
-                 len(extracted_files), zip_path)
-
-    return extracted_files
+            if file.is_dir():
+                continue
+
+            member = BytesIO(zip_data.read(file))
+            suffix = PurePosixPath(file.filename).suffix
+            member.name = f"{prefix}-{i}-{system_id}{suffix}"
+            count += 1
+
+            yield member
+
+    logging.info("Read %d files from %s.", count, zip_name)
+
+
+@contextmanager
+def spill(member: BinaryIO) -> Iterator[Path]:
+    """Write an in-memory file to a temporary directory, for extractors that
+    can only open files by path
+
+    Parameters
+    ----------
+    member: BinaryIO
+        binary file object with the file name as its name attribute
+
+    Returns
+    -------
+    Iterator[Path]
+        location of the temporary copy, which keeps the member's file name
+        and is deleted when the context exits
+    """
+    directory = tempfile.mkdtemp(prefix="csam-inventory-")
+    file_path = Path(directory) / Path(source_name(member)).name
+
+    try:
+        member.seek(0)
+
+        with open(file_path, 'wb') as out_file:
+            shutil.copyfileobj(member, out_file)
+
+        yield file_path
+
+    finally:
+        # ignore errors since Word can hold files open briefly after closing
+        shutil.rmtree(directory, ignore_errors=True)
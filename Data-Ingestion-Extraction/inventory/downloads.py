@@ -0,0 +1,197 @@
+"""Detect completed browser downloads in a staging directory
+
+Chrome saves a download under a temporary name ending in .crdownload (or .tmp)
+and renames it once the download completes. A DownloadWatcher notices that
+rename through filesystem notifications when the optional watchdog package is
+installed, and otherwise polls the staging directory with backoff. Because
+finished files are moved out of the staging directory after each download, it
+only ever holds a handful of entries, so each check is cheap.
+"""
+
+import os
+import queue
+import time
+
+from pathlib import Path
+from typing import Optional, Set
+
+from .log import LoggingBase
+from .waits import Waiter
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - depends on the environment
+    FileSystemEventHandler = object
+    Observer = None
+
+# suffixes of files that are still being written by the browser
+PARTIAL_SUFFIXES = ('.crdownload', '.tmp', '.part')
+
+
+def is_partial(file_name: str) -> bool:
+    """Determine whether a file is an unfinished download
+
+    Parameters
+    ----------
+    file_name: str
+        name of the file
+
+    Returns
+    -------
+    bool
+        whether the name marks a download still in progress
+    """
+    return file_name.lower().endswith(PARTIAL_SUFFIXES)
+
+
+class _EventQueueHandler(FileSystemEventHandler):
+    """Forward filesystem events to a queue"""
+
+    def __init__(self, events: queue.Queue) -> None:
+        super().__init__()
+        self._events = events
+
+    def on_any_event(self, event) -> None:
+        self._events.put(event)
+
+
+class DownloadWatcher(LoggingBase):
+    """Wait for a single download to complete in a staging directory
+
+    The watcher should be started before the download is triggered, so that
+    files already present are not mistaken for the new download:
+
+        with DownloadWatcher(staging_path, 60) as watcher:
+            link.click()
+            path = watcher.wait()
+    """
+
+    def __init__(self, directory: Path, timeout: float,
+                 use_notifications: bool = True) -> None:
+        """Initialize an instance of the DownloadWatcher class
+
+        Parameters
+        ----------
+        directory: Path
+            staging directory into which the browser saves the download
+
+        timeout: float
+            seconds to wait for the download to complete
+
+        use_notifications: bool
+            whether to use filesystem notifications if watchdog is installed;
+            if False, or watchdog is not installed, the directory is polled
+        """
+        super().__init__()
+        self._directory = Path(directory)
+        self._timeout = timeout
+        self._use_notifications = use_notifications and Observer is not None
+        self._existing = set()  # type: Set[str]
+        self._events = queue.Queue()  # type: queue.Queue
+        self._observer = None
+
+    def __enter__(self) -> 'DownloadWatcher':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Record the files already in the staging directory and, if
+        available, begin listening for filesystem notifications"""
+        self._existing = set(os.listdir(self._directory))
+
+        if self._use_notifications:
+            self._observer = Observer()
+            self._observer.schedule(_EventQueueHandler(self._events),
+                                    str(self._directory), recursive=False)
+            self._observer.start()
+
+    def stop(self) -> None:
+        """Stop listening for filesystem notifications"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _finished_file(self) -> Optional[Path]:
+        """Look for a completed download in the staging directory
+
+        Returns
+        -------
+        Path
+            location of a new file whose download has completed, or None if
+            the download is missing or still in progress
+        """
+        new_files = set(os.listdir(self._directory)) - self._existing
+
+        if not new_files or any(is_partial(x) for x in new_files):
+            return None
+
+        return self._directory / sorted(new_files)[0]
+
+    def wait(self) -> Path:
+        """Wait for the download to complete
+
+        Returns
+        -------
+        Path
+            location of the downloaded file; if the download does not
+            complete within the timeout, a TimeoutError is raised
+        """
+        if self._observer is None:
+            return Waiter(self._timeout).until(self._finished_file,
+                                               str(self._directory))
+
+        deadline = time.monotonic() + self._timeout
+
+        # check once in case the download finished before the observer
+        # started, then re-check after each notification
+        while True:
+            finished = self._finished_file()
+
+            if finished is not None:
+                return finished
+
+            remaining = deadline - time.monotonic()
+
+            try:
+                self._events.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                raise TimeoutError("Download failed or did not complete.")
+
+            # drain notifications that arrived together with this one
+            while not self._events.empty():
+                self._events.get_nowait()
+
+
+def move_download(source: Path, target: Path, timeout: float = 10) -> Path:
+    """Move a finished download, retrying while the browser still holds the
+    file open (which makes the move fail on Windows)
+
+    Parameters
+    ----------
+    source: Path
+        location of the downloaded file
+
+    target: Path
+        location to move the file to, replacing any existing file
+
+    timeout: float
+        seconds to keep retrying before giving up
+
+    Returns
+    -------
+    Path
+        the target location; a TimeoutError is raised if the file cannot be
+        moved within the timeout
+    """
+    def try_move() -> Optional[Path]:
+        try:
+            return Path(source).replace(target)
+        except PermissionError:
+            return None
+
+    return Waiter(timeout).until(try_move, f"move {Path(source).name}")
@@ -0,0 +1,277 @@
+"""Write the consolidated hardware inventory in a choice of formats
+
+The inventory is assembled as columns (csam_id, org, acronym, id_acronym,
+hostname) and handed to a writer for the selected format. CSV is written a
+system at a time, formatting the fields shared by the system's hosts once and
+joining its hostnames into a single write. Parquet and Arrow IPC files are
+written with the optional pyarrow package, with the org and acronym columns
+dictionary-encoded since they repeat for every host of a system; these files
+load without parsing text, and Parquet files are also much smaller.
+"""
+
+import csv
+import io
+import itertools
+import logging
+import re
+
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+ARROW_FORMAT = "arrow"
+
+DEFAULT_FORMAT = CSV_FORMAT
+
+COLUMNS = ["csam_id", "org", "acronym", "id_acronym", "hostname"]
+
+# columns stored as dictionaries of their distinct values
+DICTIONARY_COLUMNS = ["org", "acronym"]
+
+# characters that require a CSV field to be quoted
+CSV_SPECIAL_REGEX = re.compile(r'[,"\r\n]')
+
+# size of the buffer used when writing CSV files
+CSV_BUFFER_SIZE = 2 ** 20
+
+
+def read_id_org_acronym(id_org_acronym_path: Path) -> Dict[int, Tuple[str,
+                                                                      str]]:
+    """Read the organization and acronym of each system
+
+    Parameters
+    ----------
+    id_org_acronym_path: Path
+        path to the CSV file listing the ID, organization and acronym of each
+        system
+
+    Returns
+    -------
+    dict[int, tuple[str, str]]
+        dictionary with system IDs as keys and (organization, acronym) as the
+        corresponding values
+    """
+    id_org_acronym = {}
+
+    with open(id_org_acronym_path) as csv_file:
+        csv_reader = csv.reader(csv_file)
+
+        for row in csv_reader:
+            id_, org, acronym = row  # type: (str, str, str)
+
+            if not id_.isnumeric():
+                continue
+
+            id_org_acronym[int(id_)] = (org, acronym)
+
+    return id_org_acronym
+
+
+def inventory_columns(inventories: Dict[int, List[str]],
+                      id_org_acronym: Dict[int, Tuple[str, str]]) -> \
+        Dict[str, list]:
+    """Lay out the inventory as columns, one row per host
+
+    Parameters
+    ----------
+    inventories: dict[int, list[str]]
+        dictionary with system IDs as keys and a sorted list of system
+        hostnames as the corresponding values
+
+    id_org_acronym: dict[int, tuple[str, str]]
+        organization and acronym of each system
+
+    Returns
+    -------
+    dict[str, list]
+        the values of each column in COLUMNS
+    """
+    columns = {x: [] for x in COLUMNS}  # type: Dict[str, list]
+
+    for system_id, hostnames in inventories.items():
+        system_id = int(system_id)
+        org, acronym = id_org_acronym.get(system_id, ("", ""))
+        count = len(hostnames)
+
+        columns["csam_id"].extend([system_id] * count)
+        columns["org"].extend([org] * count)
+        columns["acronym"].extend([acronym] * count)
+        columns["id_acronym"].extend([f"{system_id}-{acronym}"] * count)
+        columns["hostname"].extend(hostnames)
+
+    return columns
+
+
+def _csv_fields(values: list) -> str:
+    """Format values as CSV fields, quoting them where needed
+
+    Parameters
+    ----------
+    values: list
+        values of the fields
+
+    Returns
+    -------
+    str
+        the fields separated by commas, without a line terminator
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow(values)
+    return buffer.getvalue()
+
+
+def write_csv(columns: Dict[str, list], output_path: Path) -> None:
+    """Write inventory columns to a CSV file
+
+    Parameters
+    ----------
+    columns: dict[str, list]
+        the values of each column in COLUMNS
+
+    output_path: Path
+        path of the file to create
+    """
+    hostnames = columns["hostname"]
+    system_fields = zip(*(columns[x] for x in COLUMNS[:-1]))
+    start = 0
+
+    with open(output_path, 'w', buffering=CSV_BUFFER_SIZE) as out_file:
+        out_file.write(_csv_fields(COLUMNS) + '\n')
+
+        # consecutive rows of a system share everything but the hostname
+        for fields, rows in itertools.groupby(system_fields):
+            end = start + len(list(rows))
+            hosts = hostnames[start:end]
+            start = end
+
+            if CSV_SPECIAL_REGEX.search(''.join(hosts)):
+                hosts = [_csv_fields([x]) for x in hosts]
+
+            prefix = _csv_fields(list(fields)) + ','
+            out_file.write(prefix + ('\n' + prefix).join(hosts) + '\n')
+
+
+def _arrow_table(columns: Dict[str, list]) -> 'pyarrow.Table':
+    """Convert inventory columns to an Arrow table
+
+    Parameters
+    ----------
+    columns: dict[str, list]
+        the values of each column in COLUMNS
+
+    Returns
+    -------
+    pyarrow.Table
+        the inventory, with the columns in DICTIONARY_COLUMNS
+        dictionary-encoded
+    """
+    arrays = []
+
+    for name in COLUMNS:
+        if name == "csam_id":
+            array = pyarrow.array(columns[name], type=pyarrow.int64())
+        else:
+            array = pyarrow.array(columns[name], type=pyarrow.string())
+
+        if name in DICTIONARY_COLUMNS:
+            array = array.dictionary_encode()
+
+        arrays.append(array)
+
+    return pyarrow.Table.from_arrays(arrays, names=COLUMNS)
+
+
+def write_parquet(columns: Dict[str, list], output_path: Path) -> None:
+    """Write inventory columns to a Parquet file
+
+    Parameters
+    ----------
+    columns: dict[str, list]
+        the values of each column in COLUMNS
+
+    output_path: Path
+        path of the file to create
+    """
+    pyarrow.parquet.write_table(_arrow_table(columns), str(output_path))
+
+
+def write_arrow(columns: Dict[str, list], output_path: Path) -> None:
+    """Write inventory columns to an Arrow IPC file
+
+    Parameters
+    ----------
+    columns: dict[str, list]
+        the values of each column in COLUMNS
+
+    output_path: Path
+        path of the file to create
+    """
+    table = _arrow_table(columns)
+
+    with pyarrow.ipc.new_file(str(output_path), table.schema) as writer:
+        writer.write_table(table)
+
+
+# writer and file suffix for each format
+EXPORT_FORMATS = {
+    CSV_FORMAT: (write_csv, ".csv"),
+    PARQUET_FORMAT: (write_parquet, ".parquet"),
+    ARROW_FORMAT: (write_arrow, ".arrow"),
+}  # type: Dict[str, Tuple[Callable[[Dict[str, list], Path], None], str]]
+
+
+def export_inventories(inventories: Dict[int, List[str]],
+                       id_org_acronym_path: Path, output_stem: str,
+                       export_format: str = DEFAULT_FORMAT) -> Path:
+    """Export system inventories to a single file
+
+    Parameters
+    ----------
+    inventories: dict[int, list[str]]
+        dictionary with system IDs as keys and a sorted list of system
+        hostnames as the corresponding values
+
+    id_org_acronym_path: Path
+        path to the CSV file listing the ID, organization and acronym of each
+        system
+
+    output_stem: str
+        path of the file to create, without a suffix; the suffix of the
+        format is added
+
+    export_format: str
+        one of the keys of EXPORT_FORMATS; Parquet and Arrow require pyarrow,
+        and CSV is written if it is not installed
+
+    Returns
+    -------
+    Path
+        path of the file created
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}.")
+
+    if export_format != CSV_FORMAT and pyarrow is None:
+        logging.warning("pyarrow is not installed; exporting %s instead of "
+                        "%s.", CSV_FORMAT, export_format)
+        export_format = CSV_FORMAT
+
+    writer, suffix = EXPORT_FORMATS[export_format]
+    output_path = Path(output_stem).with_suffix(suffix)
+
+    columns = inventory_columns(inventories,
+                                read_id_org_acronym(id_org_acronym_path))
+    writer(columns, output_path)
+
+    logging.info("Exported %d hosts to %s.", len(columns["hostname"]),
+                 output_path)
+
+    return output_path
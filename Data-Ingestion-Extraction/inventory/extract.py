@@ -1,56 +1,225 @@
 """Simplified interface for data extraction modules"""
 
+import functools
+import importlib.util
 import logging
+import time
 
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
 
-from .data_extraction import word, zip_archive
+from .data_extraction import zip_archive
+from .data_extraction.utils import source_name
 
+Extractor = Callable[[Union[str, BinaryIO]], List[str]]
 
-# data extractors by file extension
+# data extractors by file extension, given as "module:function" with the
+# module relative to this package; a module is only imported the first time a
+# file with one of its extensions is processed, so heavy backends such as
+# win32com are never loaded on machines that never see those files
 EXTRACTORS = {
-    '.doc': word.extract_hostnames,
-    '.docx': word.extract_hostnames,
-    '.pdf': word.extract_hostnames,
-    '.xls': lambda x: [],
-    '.xlsx': lambda x: [],
-    '.zip': zip_archive.extract_hostnames
+    '.doc': '.data_extraction.word:extract_hostnames',
+    '.docx': '.data_extraction.word:extract_hostnames',
+    '.pdf': '.data_extraction.word:extract_hostnames',
+    '.xlsx': '.data_extraction.excel:extract_hostnames',
+}  # type: Dict[str, Union[str, Extractor]]
+
+# extractors for Word and PDF files, by processing.word_backend setting; the
+# com backend drives Word and only runs on Windows, the python backend reads
+# .docx and .pdf files directly but cannot read .doc files
+WORD_BACKENDS = {
+    'com': '.data_extraction.word:extract_hostnames',
+    'python': '.data_extraction.document:extract_hostnames',
 }
 
+DEFAULT_WORD_BACKEND = 'com'
+
+WORD_EXTENSIONS = ('.doc', '.docx', '.pdf')
+
+# keyword arguments passed to the extractor of each extension, such as the
+# workbook reader engine and loading mode selected by processing.excel_engine
+# and processing.excel_mode
+EXTRACTOR_OPTIONS = {}  # type: Dict[str, Dict]
+
+# extensions whose extractors can read a binary file object directly; files
+# of other types read from a ZIP file are written to a temporary file first
+FILE_OBJECT_EXTENSIONS = {'.xlsx'}
+
+# file types that are recognized but cannot be read, such as legacy Excel
+# workbooks which openpyxl does not support
+UNSUPPORTED_EXTENSIONS = {'.xls'}
+
+# seconds spent importing each extractor module, by module name
+IMPORT_TIMES = {}  # type: Dict[str, float]
+
+_loaded = {}  # type: Dict[str, Extractor]
+
+
+def register_extractor(extension: str, extractor: Union[str, Extractor],
+                       file_objects: bool = False,
+                       options: Optional[Dict] = None) -> None:
+    """Register an extractor for a file extension, replacing any existing one
+
+    Parameters
+    ----------
+    extension: str
+        file extension, including the leading period
+
+    extractor: Union[str, Callable]
+        the extractor function, or its location as "module:function"; a
+        relative module name is resolved against this package
+
+    file_objects: bool
+        whether the extractor can read a binary file object as well as a path
+
+    options: Dict
+        keyword arguments passed to the extractor with each file
+    """
+    extension = extension.lower()
+    EXTRACTORS[extension] = extractor
+    EXTRACTOR_OPTIONS[extension] = dict(options or {})
+    _loaded.pop(extension, None)
+
+    if file_objects:
+        FILE_OBJECT_EXTENSIONS.add(extension)
+    else:
+        FILE_OBJECT_EXTENSIONS.discard(extension)
+
+
+def configure(options: Optional[Dict] = None) -> None:
+    """Select extractors according to processing settings
+
+    Parameters
+    ----------
+    options: Dict
+        the processing section of the configuration; word_backend selects
+        one of WORD_BACKENDS, default: DEFAULT_WORD_BACKEND; excel_engine
+        and excel_mode select the workbook reader engine and loading mode,
+        default: the Excel extractor's defaults
+    """
+    backend = (options or {}).get('word_backend', DEFAULT_WORD_BACKEND)
+
+    if backend not in WORD_BACKENDS:
+        raise ValueError(f"Unknown Word backend: {backend}.")
 
-def extract_hostnames(file_path: str) -> List[str]:
+    for extension in WORD_EXTENSIONS:
+        if EXTRACTORS.get(extension) != WORD_BACKENDS[backend]:
+            register_extractor(extension, WORD_BACKENDS[backend])
+
+    excel_options = {
+        x: (options or {}).get(f'excel_{x}') for x in ('engine', 'mode')
+    }
+    excel_options = {x: y for x, y in excel_options.items() if y}
+
+    if EXTRACTOR_OPTIONS.get('.xlsx', {}) != excel_options:
+        register_extractor('.xlsx', '.data_extraction.excel:extract_hostnames',
+                           file_objects=True, options=excel_options)
+
+
+def describe_extractors() -> str:
+    """Describe the registered extractors, so that results from different
+    extractor configurations can be told apart
+
+    Returns
+    -------
+    str
+        each extension and the location of its extractor, one per line
+    """
+    lines = []
+
+    for extension, extractor in sorted(EXTRACTORS.items()):
+        if not isinstance(extractor, str):
+            extractor = f"{extractor.__module__}:{extractor.__qualname__}"
+
+        options = EXTRACTOR_OPTIONS.get(extension)
+        lines.append(f"{extension}={extractor} {options or ''}".strip())
+
+    return "\n".join(lines)
+
+
+def load_extractor(extension: str) -> Extractor:
+    """Look up the extractor for a file extension, importing its module on
+    first use
+
+    Parameters
+    ----------
+    extension: str
+        file extension, including the leading period, in lower case
+
+    Returns
+    -------
+    Callable
+        the extractor function; a KeyError is raised if no extractor is
+        registered for the extension
+    """
+    if extension in _loaded:
+        return _loaded[extension]
+
+    extractor = EXTRACTORS[extension]
+
+    if isinstance(extractor, str):
+        module_name, function_name = extractor.split(':')
+        module_key = importlib.util.resolve_name(module_name, __package__)
+        start = time.perf_counter()
+        module = importlib.import_module(module_key)
+
+        if module_key not in IMPORT_TIMES:
+            IMPORT_TIMES[module_key] = time.perf_counter() - start
+            logging.info("Imported %s in %.3f s.", module_key,
+                         IMPORT_TIMES[module_key])
+
+        extractor = getattr(module, function_name)
+
+    if EXTRACTOR_OPTIONS.get(extension):
+        extractor = functools.partial(extractor,
+                                      **EXTRACTOR_OPTIONS[extension])
+
+    _loaded[extension] = extractor
+    return extractor
+
+
+def extract_hostnames(file_path: Union[str, BinaryIO]) -> List[str]:
     """Extract hostnames from a file; this function is a simplified interface
     to the classes and functions found in the data extraction folder/package
 
     Parameters
     ----------
-    file_path: str
-        path to the file from which hostnames should be extracted
+    file_path: Union[str, BinaryIO]
+        path to the file from which hostnames should be extracted, or a binary
+        file object holding the file with its name as the name attribute
 
     Returns
     -------
     List[str]
         a list of hostnames, possibly an empty list if no hostnames were found
     """
-    path = Path(file_path)
-    extension = path.suffix.lower()
-
-    if extension not in EXTRACTORS.keys():
-        logging.warning("Unknown file type: %s (%s).", extension, file_path)
-        return []
-
-    results = EXTRACTORS[extension](file_path)
+    file_name = source_name(file_path)
+    extension = Path(file_name).suffix.lower()
 
-    # zip extraction will not return hostnames but a list of files that must
-    # be processed further
+    # files in a zip file are read into memory and processed in turn
     if extension == ".zip":
         hostnames = []
 
-        for result_path in results:
-            names = extract_hostnames(result_path)
+        for member in zip_archive.iter_members(file_path):
+            names = extract_hostnames(member)
             hostnames.extend(names)
 
-        results = hostnames
+        return hostnames
+
+    if extension in UNSUPPORTED_EXTENSIONS:
+        logging.warning("Unsupported file type: %s (%s).", extension,
+                        file_name)
+        return []
+
+    if extension not in EXTRACTORS.keys():
+        logging.warning("Unknown file type: %s (%s).", extension, file_name)
+        return []
+
+    extractor = load_extractor(extension)
+
+    if (not isinstance(file_path, (str, Path))
+            and extension not in FILE_OBJECT_EXTENSIONS):
+        with zip_archive.spill(file_path) as spilled_path:
+            return extractor(str(spilled_path))
 
-    return results
+    return extractor(file_path)
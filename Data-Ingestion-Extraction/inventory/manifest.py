@@ -0,0 +1,217 @@
+"""Run manifest recording the download status of each system
+
+The manifest is a JSON file mapping system IDs to the outcome of the most
+recent attempt to download their hardware inventory, the SHA-256 of the
+downloaded file and when the attempt was made. It is rewritten after every
+system, so an interrupted run can be resumed by skipping systems that were
+downloaded recently, or repeated for just the systems that failed.
+"""
+
+import json
+import os
+import threading
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cache import file_digest
+from .log import LoggingBase
+
+MANIFEST_FILE_NAME = "download-manifest.json"
+
+# hours for which a download is considered fresh if
+# scraping.freshness_hours is not set
+DEFAULT_FRESHNESS_HOURS = 24
+
+# statuses of a system's most recent download attempt
+DOWNLOADED = "downloaded"
+NO_INVENTORY = "no_inventory"
+FAILED = "failed"
+
+
+def default_manifest_path(config: Dict) -> Path:
+    """Determine where the run manifest is stored
+
+    Parameters
+    ----------
+    config: Dict
+        dictionary containing configuration data
+
+    Returns
+    -------
+    Path
+        scraping.manifest_path if set, otherwise a file next to the download
+        path
+    """
+    manifest_path = config['scraping'].get('manifest_path')
+
+    if manifest_path:
+        return Path(manifest_path)
+
+    download_path = Path(config['scraping']['download_path']).resolve()
+    return download_path.parent / MANIFEST_FILE_NAME
+
+
+class RunManifest(LoggingBase):
+    """Thread-safe record of the download status of each system"""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize an instance of the RunManifest class, loading any
+        existing manifest
+
+        Parameters
+        ----------
+        path: Path
+            location of the JSON manifest file
+        """
+        super().__init__()
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = {}  # type: Dict[str, Dict]
+
+        if self._path.exists():
+            with open(self._path, 'r') as manifest_file:
+                self._entries = json.load(manifest_file)
+
+            self.logger.info("Loaded manifest with %d systems from %s.",
+                             len(self._entries), self._path)
+
+    def _save(self) -> None:
+        """Write the manifest to a temporary file and move it into place, so
+        an interrupted write never leaves a truncated manifest"""
+        partial_path = self._path.with_name(self._path.name + ".tmp")
+
+        with open(partial_path, 'w') as manifest_file:
+            json.dump(self._entries, manifest_file, indent=2, sort_keys=True)
+
+        os.replace(partial_path, self._path)
+
+    def record(self, system_id: int, status: str,
+               file_path: Optional[Path] = None,
+               error: Optional[str] = None) -> None:
+        """Record the outcome of a download attempt and save the manifest
+
+        Parameters
+        ----------
+        system_id: int
+            ID of the system
+
+        status: str
+            one of DOWNLOADED, NO_INVENTORY or FAILED
+
+        file_path: Path
+            location of the downloaded file, if any
+
+        error: str
+            description of the failure, if any
+        """
+        entry = {
+            'status': status,
+            'timestamp': datetime.now(timezone.utc).isoformat(
+                timespec='seconds'
+            ),
+        }
+
+        if file_path is not None:
+            entry['file'] = Path(file_path).name
+            entry['sha256'] = file_digest(str(file_path))
+
+        if error is not None:
+            entry['error'] = error
+
+        with self._lock:
+            self._entries[str(system_id)] = entry
+            self._save()
+
+    def _is_fresh(self, entry: Dict, output_path: Path,
+                  cutoff: datetime) -> bool:
+        """Determine whether a system's last download can be reused
+
+        Parameters
+        ----------
+        entry: Dict
+            manifest entry of the system
+
+        output_path: Path
+            directory containing downloaded inventories
+
+        cutoff: datetime
+            attempts before this time are stale
+
+        Returns
+        -------
+        bool
+            whether the last attempt succeeded after the cutoff and, if a file
+            was downloaded, the file is still present
+        """
+        if entry['status'] not in (DOWNLOADED, NO_INVENTORY):
+            return False
+
+        if datetime.fromisoformat(entry['timestamp']) < cutoff:
+            return False
+
+        return (entry['status'] == NO_INVENTORY
+                or (output_path / entry['file']).exists())
+
+    def pending(self, system_ids: List[int], output_path: Path,
+                freshness_hours: float) -> List[int]:
+        """Select the systems that need to be downloaded
+
+        Parameters
+        ----------
+        system_ids: List[int]
+            IDs of all systems
+
+        output_path: Path
+            directory containing downloaded inventories
+
+        freshness_hours: float
+            systems successfully downloaded within this many hours are
+            skipped; 0 downloads every system
+
+        Returns
+        -------
+        List[int]
+            IDs of systems without a fresh download, in the given order
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=freshness_hours)
+
+        with self._lock:
+            return [x for x in system_ids
+                    if freshness_hours <= 0
+                    or str(x) not in self._entries
+                    or not self._is_fresh(self._entries[str(x)],
+                                          Path(output_path), cutoff)]
+
+    def failed(self) -> List[int]:
+        """List the systems whose last download attempt failed
+
+        Returns
+        -------
+        List[int]
+            IDs of failed systems, in ascending order
+        """
+        with self._lock:
+            return sorted(int(x) for x, entry in self._entries.items()
+                          if entry['status'] == FAILED)
+
+    def log_summary(self, system_ids: List[int]) -> None:
+        """Log how many of the given systems ended in each status
+
+        Parameters
+        ----------
+        system_ids: List[int]
+            IDs of the systems attempted in this run
+        """
+        counts = {}  # type: Dict[str, int]
+
+        with self._lock:
+            for system_id in system_ids:
+                status = self._entries.get(str(system_id), {}).get('status')
+
+                if status is not None:
+                    counts[status] = counts.get(status, 0) + 1
+
+        for status, count in sorted(counts.items()):
+            self.logger.info("Systems with status %s: %d.", status, count)
@@ -0,0 +1,118 @@
+"""Run hostname extraction over many inventory files, optionally fanning the
+files out across a pool of worker processes
+"""
+
+import logging
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import extract
+
+
+def extract_file(file_path: str) -> Tuple[str, List[str], float]:
+    """Extract hostnames from a single file and time the extraction
+
+    This function is used as the unit of work for worker processes, so it must
+    remain a module level function that can be pickled.
+
+    Parameters
+    ----------
+    file_path: str
+        path to the file from which hostnames should be extracted
+
+    Returns
+    -------
+    str, List[str], float
+        the file path, the list of hostnames found in the file and the wall
+        time in seconds spent extracting them
+    """
+    start = time.perf_counter()
+    hostnames = extract.extract_hostnames(file_path)
+    return file_path, hostnames, time.perf_counter() - start
+
+
+def _init_worker(log_level: int, options: Optional[Dict]) -> None:
+    """Configure logging and extractors in a newly started worker process
+
+    Parameters
+    ----------
+    log_level: int
+        logging level used by the parent process
+
+    options: Dict
+        processing settings used to select extractors
+    """
+    logging.basicConfig(level=log_level)
+    extract.configure(options)
+
+
+def resolve_workers(workers: int) -> int:
+    """Translate a configured worker count into the number of processes to use
+
+    Parameters
+    ----------
+    workers: int
+        configured number of workers; values less than 1 use one worker per
+        available CPU
+
+    Returns
+    -------
+    int
+        number of worker processes
+    """
+    if workers < 1:
+        return os.cpu_count() or 1
+
+    return workers
+
+
+def extract_files(
+        file_paths: List[str], workers: int = 1,
+        options: Optional[Dict] = None
+) -> Iterator[Tuple[str, List[str], float]]:
+    """Extract hostnames from multiple files
+
+    Parameters
+    ----------
+    file_paths: List[str]
+        paths to the files from which hostnames should be extracted
+
+    workers: int
+        number of worker processes; with a single worker, files are processed
+        serially in the current process
+
+    options: Dict
+        processing settings used to select extractors, such as word_backend;
+        see extract.configure
+
+    Returns
+    -------
+    Iterator[Tuple[str, List[str], float]]
+        for each file, the file path, the list of hostnames found in the file
+        and the wall time in seconds spent extracting them; with more than one
+        worker, results are yielded in order of completion
+    """
+    workers = resolve_workers(workers)
+    extract.configure(options)
+
+    if workers == 1 or len(file_paths) < 2:
+        for file_path in file_paths:
+            yield extract_file(file_path)
+
+        return
+
+    logging.info("Extracting hostnames from %d files with %d workers.",
+                 len(file_paths), workers)
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().getEffectiveLevel(), options)
+    ) as executor:
+        futures = [executor.submit(extract_file, x) for x in file_paths]
+
+        for future in as_completed(futures):
+            yield future.result()
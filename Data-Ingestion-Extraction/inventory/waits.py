@@ -0,0 +1,145 @@
+"""Explicit waits with exponential backoff and timing statistics
+
+A wait repeatedly evaluates a condition until it returns a result or a
+timeout expires, sleeping between attempts for an interval that grows from
+INITIAL_INTERVAL up to MAX_INTERVAL. The time spent on each wait is recorded
+by key (for example, a selector) so slow pages can be identified.
+"""
+
+import time
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .log import LoggingBase
+
+T = TypeVar('T')
+
+# seconds between the first two attempts
+INITIAL_INTERVAL = 0.05
+
+# upper limit on seconds between attempts
+MAX_INTERVAL = 1.0
+
+# factor by which the interval grows after each failed attempt
+BACKOFF_FACTOR = 1.5
+
+
+class WaitStatistics:
+    """Timing statistics for waits, grouped by key"""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the WaitStatistics class"""
+        self._durations = defaultdict(list)  # type: Dict[str, List[float]]
+        self._timeouts = defaultdict(int)  # type: Dict[str, int]
+
+    def record(self, key: str, elapsed: float, timed_out: bool) -> None:
+        """Record the outcome of a wait
+
+        Parameters
+        ----------
+        key: str
+            name of the thing waited for, such as a selector
+
+        elapsed: float
+            seconds spent waiting
+
+        timed_out: bool
+            whether the wait ended in a timeout
+        """
+        self._durations[key].append(elapsed)
+
+        if timed_out:
+            self._timeouts[key] += 1
+
+    def summary(self) -> List[Tuple[str, int, float, float, int]]:
+        """Summarize the recorded waits, slowest first
+
+        Returns
+        -------
+        List[Tuple[str, int, float, float, int]]
+            for each key, the key, the number of waits, the mean and maximum
+            wait in seconds, and the number of timeouts, ordered by total
+            time spent waiting
+        """
+        rows = [
+            (key, len(durations), sum(durations) / len(durations),
+             max(durations), self._timeouts[key])
+            for key, durations in self._durations.items()
+        ]
+
+        return sorted(rows, key=lambda x: x[1] * x[2], reverse=True)
+
+
+class Waiter(LoggingBase):
+    """Wait for conditions using exponential backoff between attempts"""
+
+    def __init__(self, timeout: float,
+                 statistics: Optional[WaitStatistics] = None) -> None:
+        """Initialize an instance of the Waiter class
+
+        Parameters
+        ----------
+        timeout: float
+            default number of seconds to wait before giving up
+
+        statistics: WaitStatistics
+            where the timing of each wait is recorded; a new instance is
+            created if not specified
+        """
+        self.timeout = timeout
+        self.statistics = statistics or WaitStatistics()
+        super().__init__()
+
+    def until(self, condition: Callable[[], Optional[T]], key: str,
+              timeout: Optional[float] = None) -> T:
+        """Wait until a condition returns a truthy result
+
+        Parameters
+        ----------
+        condition: Callable
+            function called with no arguments that returns a falsy value
+            while the wait should continue
+
+        key: str
+            name under which the timing of the wait is recorded
+
+        timeout: float
+            seconds to wait before giving up; defaults to the timeout given
+            when the Waiter was created
+
+        Returns
+        -------
+        T
+            the first truthy result of the condition; if no such result is
+            returned within the timeout, a TimeoutError is raised
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = INITIAL_INTERVAL
+
+        while True:
+            result = condition()
+
+            if result:
+                self.statistics.record(key, time.monotonic() - start, False)
+                return result
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                self.statistics.record(key, time.monotonic() - start, True)
+                raise TimeoutError(f"Timed out after {timeout} s waiting for "
+                                   f"{key}.")
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * BACKOFF_FACTOR, MAX_INTERVAL)
+
+    def log_statistics(self) -> None:
+        """Log the timing statistics of waits, slowest first"""
+        for key, count, mean, maximum, timeouts in self.statistics.summary():
+            self.logger.info(
+                "Waited for %s %d times: mean %.2f s, max %.2f s, "
+                "%d timeouts.", key, count, mean, maximum, timeouts
+            )
@@ -0,0 +1,136 @@
+'''Compare extracting hosts row by row with the vectorized HostExtractor
+
+Synthetic V2.3 template sheets are generated in memory, so only host
+extraction is timed and not workbook reading. The row-by-row method is the
+loop HostExtractor._extract_hosts used before: each row is cleaned and
+checked in Python and collected as a tuple, and the hosts are then turned
+into a DataFrame from a list of dicts.
+
+Usage:
+    python benchmarks/extract_hosts.py [--sheets 500] [--rows 2000]
+'''
+
+import argparse
+import random
+import sys
+import time
+
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from host_extractor import (HOSTNAME_REGEX, IP_ADDR_REGEX,  # noqa: E402
+                            SCHEMAS, V2_3_TEMPLATE, HostExtractor)
+
+
+def build_workbook(sheets, rows, schema):
+    '''Generate sheets of hosts: mostly hostnames and FQDNs, with some IP
+    addresses, invalid names, blanks and duplicates'''
+    random.seed(0)
+    # a few distinct values per column keeps memory use down
+    pools = {x: [f'{x} {i}' for i in range(20)]
+             for x in schema.sheet_columns[1:]}
+    workbook = {}
+
+    for sheet in range(sheets):
+        hostnames = []
+
+        for row in range(rows):
+            kind = random.random()
+
+            if kind < 0.05:
+                hostnames.append('')
+            elif kind < 0.10:
+                hostnames.append(f'10.{sheet % 256}.{row // 256}.{row % 256}')
+            elif kind < 0.12:
+                hostnames.append(f'bad/name {row}')
+            elif kind < 0.20 and hostnames:
+                hostnames.append(random.choice(hostnames))
+            elif kind < 0.50:
+                hostnames.append(f'Host{row:05d}.Example.GOV')
+            else:
+                hostnames.append(f' host-{sheet}-{row} ')
+
+        data = {schema.sheet_columns[0]: hostnames}
+        data.update({x: random.choices(y, k=rows) for x, y in pools.items()})
+        workbook[f'HW-Inventory-{sheet}'] = pd.DataFrame(data)
+
+    return workbook
+
+
+def clean_hostname(hostname):
+    hostname = str(hostname).replace(' ', '').strip().lower()
+
+    if IP_ADDR_REGEX.match(hostname):
+        return hostname
+    elif '.' in hostname:
+        hostname, _ = hostname.split('.', 1)
+
+    return hostname
+
+
+def extract_row_by_row(workbook_data, schema):
+    '''Extract hosts one row at a time and build the output from dicts'''
+    output_data = []
+    bad_hostnames = []
+
+    for system, system_data in workbook_data.items():
+        hosts = {}
+        rows = system_data[schema.sheet_columns].itertuples(index=False,
+                                                            name=None)
+
+        for row in rows:
+            hostname = clean_hostname(row[0])
+
+            if not hostname:
+                continue
+
+            if IP_ADDR_REGEX.match(hostname):
+                if not schema.keep_ip_hostnames:
+                    continue
+            elif not HOSTNAME_REGEX.match(hostname):
+                bad_hostnames.append((system, hostname))
+                continue
+
+            hosts[(hostname,) + row[1:]] = None
+
+        for host in hosts:
+            record = dict(zip(schema.output_columns, host))
+            record['system'] = system
+            output_data.append(record)
+
+    return pd.DataFrame(output_data), bad_hostnames
+
+
+def time_call(name, function, *args):
+    '''Time an extraction and return a hash of each host and the bad
+    hostnames; the hosts themselves are not kept, so that only one method's
+    output is in memory at a time'''
+    start = time.perf_counter()
+    hosts, bad_hostnames = function(*args)
+    print(f'{name:>14}: {time.perf_counter() - start:6.2f} s, '
+          f'{len(hosts)} hosts, {len(bad_hostnames)} bad hostnames')
+
+    return (pd.util.hash_pandas_object(hosts, index=False).to_numpy(),
+            bad_hostnames)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=500)
+    parser.add_argument('--rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    schema = SCHEMAS[V2_3_TEMPLATE]
+    workbook = build_workbook(args.sheets, args.rows, schema)
+    # extraction does not use the organization mapping, so none is loaded
+    extractor = HostExtractor.__new__(HostExtractor)
+
+    result = time_call('vectorized', extractor._extract_hosts, workbook,
+                       schema)
+    expected = time_call('row by row', extract_row_by_row, workbook, schema)
+
+    if not ((result[0] == expected[0]).all() and result[1] == expected[1]):
+        raise RuntimeError('The methods extracted different hosts.')
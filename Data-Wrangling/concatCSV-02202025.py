@@ -1,44 +1,51 @@
-import subprocess
-import pandas as pd
-
+'''Extract the hosts of every template's combined workbook and concatenate
+them into master_output_with_ips.csv
 
-def run_script(script_path, *args):
-    command = ['python', script_path, *args]
-    subprocess.run(command, check=True)
+All workbooks are converted in this process: the organization mapping is
+loaded once, each combined workbook is read once, and the hosts are
+concatenated in memory instead of being read back from the CSV files.
+'''
 
+import argparse
 
-# Run the first script
-print('New Template Ver 2.3 Inventory Extraction Begins.....')
-run_script('generate_hosts_02202025.py', 'CSAM-org-acronym.xlsx', 'CorrectedCombinedFile-CSAMTemplate.xlsx', '.')
+import pandas as pd
 
-# Run the second script
-print('New Template Ver 2 Inventory Extraction Begins.....')
-run_script('clear_tuple_02202025.py', 'CSAM-org-acronym.xlsx', 'CorrectedCombinedFile-NewTemplate.xlsx', '.')
+from host_extractor import (HostExtractor, OLD_TEMPLATE, SCHEMAS,
+                            V2_0_TEMPLATE, V2_3_TEMPLATE)
+from readers import add_engine_argument
 
-# Run the third script
-print('Old Template Inventory Extraction Begins.....')
-run_script('updated_generate_hosts_02202025.py', 'CSAM-org-acronym.xlsx', 'Raw-CombinedFile-OldTemplate.xlsx', '.')
 
+ORG_MAPPING_PATH = 'CSAM-org-acronym.xlsx'
 
-# Read the content of all output CSV files
-df1 = pd.read_csv('generate_hosts.csv').dropna(how='all')  # Drop rows where all values are NaN
-df2 = pd.read_csv('clear_tuple_host_new_template.csv').dropna(how='all')  # Drop rows where all values are NaN
-df3 = pd.read_csv('host_data.csv').dropna(how='all')  # Drop rows where all values are NaN
+# (description, template, combined workbook), in output order
+WORKBOOKS = [
+    ('New Template Ver 2.3', V2_3_TEMPLATE,
+     'CorrectedCombinedFile-CSAMTemplate.xlsx'),
+    ('New Template Ver 2', V2_0_TEMPLATE,
+     'CorrectedCombinedFile-NewTemplate.xlsx'),
+    ('Old Template', OLD_TEMPLATE, 'Raw-CombinedFile-OldTemplate.xlsx'),
+]
 
 
-# Print the number of rows in each DataFrame for diagnostic purposes
-print(f'df1 V2.3 CSAM template rows: {len(df1)}')
-print(f'df2 V2.0 Template rows: {len(df2)}')
-print(f'df3 Old Template rows: {len(df3)}')
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_engine_argument(parser)
+    args = parser.parse_args()
 
-df1.reset_index(drop=True, inplace=True)
-df2.reset_index(drop=True, inplace=True)
-df3.reset_index(drop=True, inplace=True)
+    extractor = HostExtractor(ORG_MAPPING_PATH, args.engine)
+    frames = []
 
-# Concatenate vertically
-# concatenated_df = pd.concat([df1, df2, df3], axis=0, ignore_index=True)
-concatenated_df = pd.concat([df1, df2, df3], axis=0, join='outer')
+    for description, template, workbook_path in WORKBOOKS:
+        print(f'{description} Inventory Extraction Begins.....')
+        # each CSV is still written for anyone reading it on its own
+        frame = extractor.process_inventory(workbook_path, '.',
+                                            SCHEMAS[template])
+        frame = frame.dropna(how='all').reset_index(drop=True)
+        print(f'{template} template rows: {len(frame)}')
+        frames.append(frame)
 
+    # Concatenate vertically
+    concatenated_df = pd.concat(frames, axis=0, join='outer')
 
-# Save the final CSV file
-concatenated_df.to_csv('master_output_with_ips.csv', index=False)
+    # Save the final CSV file
+    concatenated_df.to_csv('master_output_with_ips.csv', index=False)
@@ -0,0 +1,283 @@
+'''Convert combined CSAM HW inventory workbooks to flat CSVs
+
+Each version of the inventory template has its own columns. A TemplateSchema
+lists the columns read from the sheets of one template, the name each gets in
+the CSV, and the files the hosts are written to. HostExtractor works with any
+schema, so a single process can load the organization mapping once and
+convert the combined workbook of every template. The mapping is loaded through
+org_mapping.OrgMapping, which caches it between runs.
+'''
+
+import argparse
+import re
+
+from pathlib import Path
+
+import pandas as pd
+
+from org_mapping import OrgMapping
+from readers import DEFAULT_ENGINE, add_engine_argument, read_workbook
+
+
+HOSTNAME_REGEX = re.compile(r'^[A-Za-z0-9_-]*$')
+IP_ADDR_REGEX = re.compile(r'^((\d+)\.){3}(\d+)$')
+
+V2_3_TEMPLATE = 'V2.3'
+V2_0_TEMPLATE = 'V2.0'
+OLD_TEMPLATE = 'old'
+EMNS_TEMPLATE = 'eMNS'
+
+HOSTNAME_COLUMN = ('Identifier or Host Name', 'hostname')
+
+# (sheet column, CSV column) pairs shared by the V2.0 and V2.3 templates
+COMMON_COLUMNS = [
+    HOSTNAME_COLUMN,
+    ('IP Address (Internal)', 'ip_address_internal'),
+    ('IP Address (External)', 'ip_address_external'),
+    ('NAT IPs', 'nat_ips'),
+    ('AD Domain', 'ad_domain'),
+    ('CPU Core', 'cpu_core'),
+    ('Memory (GB)', 'memory'),
+    ('Drive Space (GB)', 'drive_space'),
+    ('High Value Asset', 'high_value_asset'),
+    ('Manufacturer Serial Number', 'manufacturer_serial_number'),
+    ('MAC Address(es)', 'mac_address'),
+    ('BIOS UUID/GUID', 'bios_uuid_guid'),
+    ('Asset Category', 'asset_category'),
+    ('Asset Type', 'asset_type'),
+    ('Virtual', 'virtual'),
+    ('Public', 'public'),
+    ('GFE', 'gfe'),
+    ('Hardware Make', 'hardware_make'),
+    ('Hardware Model', 'hardware_model'),
+    ('OS Name', 'os_name'),
+    ('OS Version', 'os_version'),
+    ('Lifecycle', 'lifecycle'),
+    ('Location', 'location'),
+    ('Hosting/CSP Contract', 'hosting_csp_contract'),
+    ('Date Device Added to System Boundary',
+     'date_device_added_to_system_boundary'),
+    ('Device Operator', 'device_operator'),
+]
+
+V2_0_COLUMNS = COMMON_COLUMNS + [
+    ('Systems Supported', 'systems_supported'),
+    ('System Owner / Device Manager', 'device_manager'),
+]
+
+V2_3_COLUMNS = COMMON_COLUMNS + [
+    ('Systems Supported CSAM Acronym', 'systems_supported_csam_acronym'),
+    ('System Owner / Device Manager', 'device_manager'),
+    ('Primary System Boundary CSAM ID', 'primary_system_boundary_csam_id'),
+    ('Primary System Boundary CSAM Acronym',
+     'primary_system_boundary_csam_acro'),
+    ('System Supported CSAM ID', 'systems_supported_id'),
+    ('First Tier Supplier', 'first_tier_supplier'),
+]
+
+
+class TemplateSchema:
+    '''Columns read from the sheets of one inventory template and the files
+    its hosts are written to'''
+
+    def __init__(self, name, columns, output_file, bad_hostnames_file,
+                 keep_ip_hostnames=True):
+        '''columns is a list of (sheet column, CSV column) pairs, starting
+        with the hostname column; hostnames that are IP addresses are
+        skipped unless keep_ip_hostnames is true'''
+        self.name = name
+        self.columns = list(columns)
+        self.output_file = output_file
+        self.bad_hostnames_file = bad_hostnames_file
+        self.keep_ip_hostnames = keep_ip_hostnames
+
+    def __repr__(self):
+        return f"TemplateSchema({self.name!r})"
+
+    @property
+    def sheet_columns(self):
+        return [x for x, _ in self.columns]
+
+    @property
+    def output_columns(self):
+        return [x for _, x in self.columns]
+
+    def without_ip_hostnames(self):
+        '''Copy of the schema that skips hostnames that are IP addresses, as
+        the scripts before the 02202025 versions did'''
+        return TemplateSchema(self.name, self.columns, self.output_file,
+                              self.bad_hostnames_file,
+                              keep_ip_hostnames=False)
+
+
+SCHEMAS = {
+    V2_3_TEMPLATE: TemplateSchema(
+        V2_3_TEMPLATE, V2_3_COLUMNS, 'generate_hosts.csv',
+        'generate_hosts_bad_hostnames.csv'
+    ),
+    V2_0_TEMPLATE: TemplateSchema(
+        V2_0_TEMPLATE, V2_0_COLUMNS, 'clear_tuple_host_new_template.csv',
+        'clear_tuple_bad_hostnames.csv'
+    ),
+    OLD_TEMPLATE: TemplateSchema(
+        OLD_TEMPLATE, [HOSTNAME_COLUMN], 'host_data.csv', 'bad_hostnames.csv'
+    ),
+    EMNS_TEMPLATE: TemplateSchema(
+        EMNS_TEMPLATE, V2_0_COLUMNS, 'hosts_eMNS.csv',
+        'hosts_eMNS_bad_hostnames.csv', keep_ip_hostnames=False
+    ),
+}
+
+
+class HostExtractor:
+    def __init__(self, org_mapping_path, engine=DEFAULT_ENGINE):
+        self._engine = engine
+        self._org_mapping = OrgMapping.load(org_mapping_path, engine)
+
+    @staticmethod
+    def _load_workbook(file_path, engine=DEFAULT_ENGINE):
+        data = read_workbook(file_path, engine)
+
+        for dataframe in data.values():
+            dataframe.dropna(how='all', inplace=True)
+            dataframe.fillna('', inplace=True)
+
+        return data
+
+    @staticmethod
+    def _clean_hostnames(hostnames):
+        '''Lowercase a column of hostnames, remove spaces and keep the part
+        before the first period, except for IP addresses; returns the
+        hostnames and a mask of the IP addresses'''
+        hostnames = (hostnames.astype(str).str.replace(' ', '', regex=False)
+                     .str.strip().str.lower())
+        is_ip = hostnames.str.match(IP_ADDR_REGEX.pattern)
+        hostnames = hostnames.where(is_ip,
+                                    hostnames.str.split('.', n=1).str[0])
+
+        return hostnames, is_ip
+
+    def _extract_hosts(self, workbook_data, schema):
+        '''Collect the distinct hosts of every sheet in one DataFrame with the
+        schema's CSV columns and a system column holding the sheet name'''
+        frames = []
+
+        for system, system_data in workbook_data.items():
+            missing_columns = [x for x in schema.sheet_columns
+                               if x not in system_data.columns]
+
+            if missing_columns:
+                print('System with incorrect sheet format: ')
+                print(system, missing_columns)
+                continue
+
+            frame = system_data[schema.sheet_columns]
+            frame.columns = schema.output_columns
+            frames.append(frame.assign(system=system))
+
+        if not frames:
+            return pd.DataFrame(columns=schema.output_columns + ['system']), []
+
+        # the sheets are cleaned and filtered together, so the cost of each
+        # column operation is paid once per workbook rather than per sheet
+        hosts = pd.concat(frames, ignore_index=True)
+        hostnames, is_ip = self._clean_hostnames(hosts['hostname'])
+        is_valid = hostnames.str.match(HOSTNAME_REGEX.pattern)
+        is_named = (hostnames != '') & ~is_ip
+        is_bad = is_named & ~is_valid
+        keep = (is_named & is_valid) | \
+            (is_ip if schema.keep_ip_hostnames else False)
+
+        bad_hostnames = list(zip(hosts['system'][is_bad], hostnames[is_bad]))
+
+        # the system column is included, so duplicates are dropped within
+        # each sheet, keeping the first occurrence
+        hosts = hosts.assign(hostname=hostnames)[keep]
+
+        return hosts.drop_duplicates(ignore_index=True), bad_hostnames
+
+    def extract(self, inventory_xlsx_path, schema):
+        '''Read a combined workbook and return its hosts as a DataFrame with
+        the organization of each system, and the hostnames that were
+        rejected'''
+        inventory_data = self._load_workbook(inventory_xlsx_path, self._engine)
+        hosts, bad_hostnames = self._extract_hosts(inventory_data, schema)
+
+        hosts['csam_id'] = hosts.pop('system').str.split('-').str[-1]
+
+        for system_id in hosts['csam_id'].unique():
+            print('System ID is: ')
+            print(system_id)
+
+        missing_ids = self._org_mapping.missing(hosts['csam_id'])
+
+        if missing_ids:
+            raise KeyError(missing_ids[0])
+
+        hosts = self._org_mapping.join(hosts)
+        hosts['id_acronym'] = hosts['csam_id'] + '-' + \
+            hosts['acronym'].astype(str)
+
+        columns = ['csam_id', 'org', 'acronym', 'id_acronym']
+        return hosts[columns + schema.output_columns], bad_hostnames
+
+    def process_inventory(self, inventory_xlsx_path, output_directory,
+                          schema):
+        '''Write the hosts of a combined workbook, and the rejected
+        hostnames, to the schema's files; the hosts are also returned'''
+        output_path = Path(output_directory)
+        output_df, bad_hostnames = self.extract(inventory_xlsx_path, schema)
+
+        output_df.to_csv(output_path / schema.output_file, index=False)
+
+        with open(output_path / schema.bad_hostnames_file, 'w',
+                  encoding='utf-8') as outfile:
+            outfile.writelines([f"{','.join(x)}\n" for x in bad_hostnames])
+
+        return output_df
+
+
+def generate_hosts_file(org_mapping_path, inventory_xlsx_path,
+        output_directory, schema, engine=DEFAULT_ENGINE):
+    extractor = HostExtractor(org_mapping_path, engine)
+    return extractor.process_inventory(inventory_xlsx_path, output_directory,
+                                       schema)
+
+
+def main(schema):
+    '''Command line entry point of the scripts that convert the combined
+    workbook of a single template'''
+    parser = argparse.ArgumentParser(description="Process CSAM inventory files")
+
+    parser.add_argument(
+        'org_mapping_path',
+        help=(
+            "path to an XLSX file that lists organization and acronym for each "
+            "CSAM ID"
+        )
+    )
+
+    parser.add_argument(
+        'inventory_xlsx_path',
+        help=(
+            "path to an XLSX file that lists host inventory for each system "
+            "in separate worksheets"
+        )
+    )
+
+    parser.add_argument(
+        'output_directory',
+        help="directory to which output files will be written"
+    )
+
+    add_engine_argument(parser)
+
+    args = parser.parse_args()
+
+    generate_hosts_file(
+        args.org_mapping_path,
+        args.inventory_xlsx_path,
+        args.output_directory,
+        schema,
+        args.engine
+    )
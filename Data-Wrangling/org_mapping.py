@@ -0,0 +1,141 @@
+'''Organization and acronym of each CSAM system
+
+The mapping is read from a workbook such as CSAM-org-acronym.xlsx into a
+DataFrame indexed by CSAM ID, and joined onto a DataFrame of hosts with a
+single merge. Reading the workbook takes longer than the rest of a small run,
+so a pickle of the DataFrame is kept next to it and reused for as long as the
+workbook is unchanged: its size and modification time are compared first,
+and its SHA-256 only if those differ.
+'''
+
+import hashlib
+import os
+import pickle
+
+from pathlib import Path
+
+import pandas as pd
+
+from readers import DEFAULT_ENGINE, read_workbook
+
+
+# workbook columns and the names they are given
+COLUMNS = {'CSAM ID': 'csam_id', 'Org': 'org', 'Acronym': 'acronym'}
+
+CACHE_SUFFIX = '.cache.pkl'
+
+# incremented when the cached table changes shape
+CACHE_VERSION = 1
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path):
+    '''SHA-256 of a file's contents, as a hexadecimal string'''
+    digest = hashlib.sha256()
+
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def default_cache_path(source_path):
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.name + CACHE_SUFFIX)
+
+
+class OrgMapping:
+    '''Organization and acronym of each system, indexed by CSAM ID'''
+
+    def __init__(self, table):
+        '''table has org and acronym columns and is indexed by csam_id, the
+        CSAM ID as a string'''
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, csam_id):
+        return csam_id in self.table.index
+
+    @classmethod
+    def from_workbook(cls, source_path, engine=DEFAULT_ENGINE):
+        '''Read the mapping from the first sheet of a workbook; when a CSAM
+        ID is listed more than once, the last row is used'''
+        data = read_workbook(source_path, engine, sheet_name=0)
+        table = data[list(COLUMNS)].rename(columns=COLUMNS)
+        table['csam_id'] = table['csam_id'].astype(str)
+        table = table.drop_duplicates('csam_id', keep='last')
+
+        return cls(table.set_index('csam_id'))
+
+    @classmethod
+    def load(cls, source_path, engine=DEFAULT_ENGINE, cache_path=None):
+        '''Load the mapping from its cache if the workbook is unchanged,
+        otherwise read the workbook and update the cache'''
+        cache_path = Path(cache_path or default_cache_path(source_path))
+        stat = os.stat(source_path)
+        cached = cls._read_cache(cache_path)
+        digest = None
+
+        if cached is not None:
+            if (cached['size'], cached['mtime_ns']) == \
+                    (stat.st_size, stat.st_mtime_ns):
+                return cls(cached['table'])
+
+            # the file was touched or copied; its contents may be the same
+            digest = file_digest(source_path)
+
+            if cached['sha256'] == digest:
+                cls._write_cache(cache_path, stat, digest, cached['table'])
+                return cls(cached['table'])
+
+        mapping = cls.from_workbook(source_path, engine)
+        cls._write_cache(cache_path, stat, digest or file_digest(source_path),
+                         mapping.table)
+
+        return mapping
+
+    @staticmethod
+    def _read_cache(cache_path):
+        try:
+            with open(cache_path, 'rb') as file:
+                cached = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError):
+            return None
+
+        if not isinstance(cached, dict) or \
+                cached.get('version') != CACHE_VERSION:
+            return None
+
+        return cached
+
+    @staticmethod
+    def _write_cache(cache_path, stat, digest, table):
+        cached = {
+            'version': CACHE_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+            'table': table,
+        }
+
+        try:
+            with open(cache_path, 'wb') as file:
+                pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as error:
+            print(f'Could not cache the organization mapping: {error}')
+
+    def missing(self, csam_ids):
+        '''CSAM IDs, in order of first appearance, that are not mapped'''
+        csam_ids = pd.Series(csam_ids).drop_duplicates()
+        return list(csam_ids[~csam_ids.isin(self.table.index)])
+
+    def join(self, frame, on='csam_id'):
+        '''Add the org and acronym of each row's system to a DataFrame,
+        keeping its rows in order; unmapped systems get missing values'''
+        return frame.merge(self.table, how='left', left_on=on,
+                           right_index=True, validate='many_to_one')
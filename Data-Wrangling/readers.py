@@ -0,0 +1,62 @@
+'''Read Excel workbooks into DataFrames with a choice of engine'''
+
+import importlib.util
+
+import pandas as pd
+
+
+# calamine (python-calamine) parses workbooks in Rust and is much faster than
+# openpyxl, which is kept for machines without python-calamine
+CALAMINE_ENGINE = 'calamine'
+OPENPYXL_ENGINE = 'openpyxl'
+ENGINES = [CALAMINE_ENGINE, OPENPYXL_ENGINE]
+
+DEFAULT_ENGINE = CALAMINE_ENGINE
+
+# pandas.read_excel accepts engine='calamine' from pandas 2.2
+CALAMINE_PANDAS_VERSION = (2, 2)
+
+
+def pandas_version():
+    '''Major and minor version of the installed pandas'''
+    return tuple(int(x) for x in pd.__version__.split('.')[:2])
+
+
+def resolve_engine(engine=DEFAULT_ENGINE):
+    '''Return the engine to use, falling back to openpyxl when calamine is
+    requested but python-calamine is not installed or pandas is too old to
+    use it'''
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown workbook engine: {engine}")
+
+    if (engine == CALAMINE_ENGINE
+            and importlib.util.find_spec('python_calamine') is None):
+        print('python-calamine is not installed, using openpyxl')
+        return OPENPYXL_ENGINE
+
+    if (engine == CALAMINE_ENGINE
+            and pandas_version() < CALAMINE_PANDAS_VERSION):
+        print(f'pandas {pd.__version__} cannot use calamine, which needs '
+              'pandas 2.2 or later, using openpyxl')
+        return OPENPYXL_ENGINE
+
+    return engine
+
+
+def read_workbook(file_path, engine=DEFAULT_ENGINE, sheet_name=None):
+    '''Read every sheet of a workbook (or only sheet_name) into DataFrames'''
+    return pd.read_excel(file_path, sheet_name=sheet_name,
+                         engine=resolve_engine(engine))
+
+
+def add_engine_argument(parser):
+    '''Add the --engine option to a script's argument parser'''
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help=(
+            "library used to read Excel workbooks; calamine is faster, "
+            "openpyxl is used if python-calamine is not installed"
+        )
+    )